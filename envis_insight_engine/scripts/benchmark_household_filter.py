@@ -0,0 +1,342 @@
+"""
+Envis Insight Engine - Household Filter Benchmarks
+
+Micro-benchmarks for the household relevance filter, run against texts
+assembled from the labelled Reddit samples.
+
+Benchmarks:
+- tokenisation: per-record scoring with the shared token view versus the
+  original per-signal implementation (each signal re-walking the text)
+- parallel: filter_dataset throughput across worker counts
+- batch: score_batch columnar arrays versus a FilterResult per record,
+  comparing latency and memory retained for the results
+- early_exit: share of signal evaluations decide() skips on the labelled
+  sample files, and its latency against score_batch
+- goal_patterns: GoalPatternSet.find against one search per pattern as
+  the number of patterns grows
+
+Usage:
+    python benchmark_household_filter.py
+    python benchmark_household_filter.py --words 500 --records 2000 --repeats 5
+    python benchmark_household_filter.py --workers 1 2 4 8 --chunk-size 500
+    python benchmark_household_filter.py --goal-patterns 11 1000 5000
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from household_filter import (  # noqa: E402
+    ALL_FIRST_PERSON,
+    HOUSEHOLD_KEYWORDS,
+    PLURAL_FIRST_PERSON,
+    SHARED_GOAL_PATTERNS,
+    GoalPatternSet,
+    HouseholdFilter,
+    HouseholdFilterConfig,
+)
+
+SAMPLE_FILES = [
+    ROOT / "data" / "samples" / "labelled_samples.json",
+    ROOT / "data" / "samples" / "labelled_samples_extended.json",
+]
+
+
+def load_sample_texts() -> List[str]:
+    """Load the raw texts from the labelled sample files."""
+    texts = []
+    for path in SAMPLE_FILES:
+        with open(path) as f:
+            data = json.load(f)
+        texts.extend(sample["text"] for sample in data.get("samples", []))
+    return texts
+
+
+def build_texts(samples: List[str], n_records: int, n_words: int, seed: int) -> List[str]:
+    """Assemble synthetic records of ``n_words`` words from shuffled samples."""
+    rng = random.Random(seed)
+    records = []
+    for _ in range(n_records):
+        words: List[str] = []
+        while len(words) < n_words:
+            words.extend(rng.choice(samples).split())
+        records.append(" ".join(words[:n_words]))
+    return records
+
+
+class ReferenceHouseholdFilter:
+    """
+    The original per-signal implementation, kept as the benchmark baseline.
+
+    Every signal re-walks the text: substring checks per keyword, a regex
+    tokenisation for pronouns, one regex per goal pattern and case-insensitive
+    person regexes over the original text.
+    """
+
+    def __init__(self, config: HouseholdFilterConfig):
+        self.config = config
+        self._goal_patterns = [re.compile(p, re.IGNORECASE) for p in SHARED_GOAL_PATTERNS]
+        self._person_patterns = [
+            re.compile(r'\b(my|our) (partner|spouse|husband|wife|son|daughter|kid|child|mom|dad|mother|father)\b', re.IGNORECASE),
+            re.compile(r'\b(he|she|they) (said|thinks|wants|needs|spent|bought)\b', re.IGNORECASE),
+        ]
+
+    def score(self, text: str) -> Dict:
+        text_lower = text.lower()
+
+        detected_keywords = [(k, s) for k, s in HOUSEHOLD_KEYWORDS.items() if k in text_lower]
+        keyword_score = max((s for _, s in detected_keywords), default=0.0)
+
+        words = re.findall(r'\b\w+\b', text_lower)
+        plural = sum(1 for w in words if w in PLURAL_FIRST_PERSON)
+        total = sum(1 for w in words if w in ALL_FIRST_PERSON)
+        pronoun_ratio = plural / total if total else 0.0
+
+        detected_patterns = [p.pattern for p in self._goal_patterns if p.findall(text_lower)]
+        shared_goal_score = min(len(detected_patterns) / 3.0, 1.0)
+
+        refs = set()
+        for pattern in self._person_patterns:
+            refs.update(' '.join(m) for m in pattern.findall(text))
+        multi_person_score = min(len(refs) / 2.0, 1.0)
+
+        relevance_score = (
+            self.config.keyword_weight * keyword_score +
+            self.config.pronoun_weight * pronoun_ratio +
+            self.config.shared_goal_weight * shared_goal_score +
+            self.config.multi_person_weight * multi_person_score
+        )
+        return {
+            "relevance_score": relevance_score,
+            "detected_keywords": detected_keywords,
+            "detected_goal_patterns": detected_patterns,
+            "person_references": refs,
+        }
+
+
+def time_per_record(fn: Callable[[str], object], texts: List[str], repeats: int) -> float:
+    """Best-of-``repeats`` wall time per record, in microseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(texts) * 1e6
+
+
+def bench_tokenisation(texts: List[str], repeats: int) -> Dict:
+    """Compare the shared-token scorer against the per-signal reference."""
+    config = HouseholdFilterConfig()
+    household_filter = HouseholdFilter(config)
+    reference = ReferenceHouseholdFilter(config)
+
+    # Equivalence check before timing
+    for text in texts:
+        expected = reference.score(text)
+        result = household_filter.score(text)
+        assert result.relevance_score == expected["relevance_score"], text
+        assert result.detected_keywords == expected["detected_keywords"], text
+        assert result.detected_goal_patterns == expected["detected_goal_patterns"], text
+        assert set(result.person_references) == expected["person_references"], text
+
+    reference_us = time_per_record(reference.score, texts, repeats)
+    shared_us = time_per_record(household_filter.score, texts, repeats)
+    return {
+        "reference_us_per_record": round(reference_us, 1),
+        "shared_tokens_us_per_record": round(shared_us, 1),
+        "speedup": round(reference_us / shared_us, 2),
+    }
+
+
+def peak_allocation(fn: Callable[[], object]) -> int:
+    """Peak bytes allocated while ``fn`` runs and its result is alive."""
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+def bench_batch(texts: List[str], repeats: int) -> Dict:
+    """Compare score_batch against building a FilterResult per record."""
+    household_filter = HouseholdFilter()
+
+    def per_record():
+        return [household_filter.score(text) for text in texts]
+
+    def columnar():
+        return household_filter.score_batch(texts)
+
+    best_per_record = best_columnar = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        per_record()
+        best_per_record = min(best_per_record, time.perf_counter() - start)
+        start = time.perf_counter()
+        columnar()
+        best_columnar = min(best_columnar, time.perf_counter() - start)
+
+    per_record_bytes = peak_allocation(per_record)
+    columnar_bytes = peak_allocation(columnar)
+    n = len(texts)
+    return {
+        "filter_result_us_per_record": round(best_per_record / n * 1e6, 1),
+        "score_batch_us_per_record": round(best_columnar / n * 1e6, 1),
+        "latency_speedup": round(best_per_record / best_columnar, 2),
+        "filter_result_peak_bytes_per_record": per_record_bytes // n,
+        "score_batch_peak_bytes_per_record": columnar_bytes // n,
+    }
+
+
+def bench_early_exit(samples: List[str], texts: List[str], repeats: int) -> Dict:
+    """Signal evaluations avoided by decide() and its per-record latency."""
+    household_filter = HouseholdFilter()
+
+    for text in samples:
+        household_filter.decide(text)
+    counts = dict(household_filter.decision_counts)
+    avoided = 1 - counts["signals_evaluated"] / (4 * counts["records"])
+
+    keep = household_filter.decide_batch(texts)
+    assert (keep == household_filter.score_batch(texts).is_household_relevant).all()
+
+    score_us = time_per_record(lambda t: household_filter.score_batch([t]), texts, repeats)
+    decide_us = time_per_record(household_filter.decide, texts, repeats)
+    return {
+        "labelled_records": counts["records"],
+        "labelled_signal_evaluations_avoided": round(avoided, 3),
+        "score_batch_us_per_record": round(score_us, 1),
+        "decide_us_per_record": round(decide_us, 1),
+    }
+
+
+def build_goal_patterns(samples: List[str], n_patterns: int, seed: int) -> List[str]:
+    """The shared goal patterns, padded to ``n_patterns`` with sample-phrase regexes."""
+    rng = random.Random(seed)
+    words = sorted({word for sample in samples for word in re.findall(r"[a-z]+", sample.lower())})
+    patterns = list(SHARED_GOAL_PATTERNS)
+    while len(patterns) < n_patterns:
+        first, second = rng.choice(words), rng.choice(words)
+        shape = rng.random()
+        if shape < 0.6:
+            pattern = f"{first} {second}"
+        elif shape < 0.8:
+            pattern = f"{first}(?:'s| is) {second}"
+        elif shape < 0.95:
+            pattern = f"(?:{first}|{second}) \\w+"
+        else:
+            # First character unknown: always re-checked
+            pattern = f"\\w*{first[-2:]} {second}"
+        patterns.append(pattern)
+    return patterns
+
+
+def bench_goal_patterns(
+    samples: List[str],
+    texts: List[str],
+    pattern_counts: List[int],
+    seed: int,
+    repeats: int,
+) -> Dict:
+    """Fused GoalPatternSet.find versus one search per pattern."""
+    results = {}
+    for n in pattern_counts:
+        patterns = build_goal_patterns(samples, n, seed)
+        pattern_set = GoalPatternSet(patterns)
+        separate = [re.compile(p) for p in patterns]
+        separate_ignore_case = [re.compile(p, re.IGNORECASE) for p in patterns]
+        lowered = [text.lower() for text in texts]
+
+        def search_each(text: str) -> List[int]:
+            return [i for i, pattern in enumerate(separate) if pattern.search(text)]
+
+        hits = 0
+        for text in lowered:
+            expected = search_each(text)
+            assert pattern_set.find(text) == expected, repr(text[:80])
+            hits += len(expected)
+        for text in lowered[:50]:
+            assert pattern_set.find(text, ignore_case=True) == [
+                i for i, pattern in enumerate(separate_ignore_case) if pattern.search(text)
+            ], repr(text[:80])
+
+        separate_us = time_per_record(search_each, lowered, repeats)
+        fused_us = time_per_record(pattern_set.find, lowered, repeats)
+        results[str(n)] = {
+            "hits_per_record": round(hits / len(lowered), 1),
+            "separate_us_per_record": round(separate_us, 1),
+            "fused_us_per_record": round(fused_us, 1),
+            "speedup": round(separate_us / fused_us, 2),
+        }
+    return results
+
+
+def bench_parallel(texts: List[str], worker_counts: List[int], chunk_size: int) -> Dict:
+    """Records per second of filter_dataset for each worker count."""
+    household_filter = HouseholdFilter()
+    expected = None
+    results = {}
+    for num_workers in worker_counts:
+        start = time.perf_counter()
+        filtered, _ = household_filter.filter_dataset(
+            texts, num_workers=num_workers, chunk_size=chunk_size,
+        )
+        elapsed = time.perf_counter() - start
+        if expected is None:
+            expected = filtered
+        assert filtered == expected, f"Output differs with {num_workers} workers"
+        results[str(num_workers)] = round(len(texts) / elapsed, 1)
+    return {"chunk_size": chunk_size, "records_per_second": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the household relevance filter")
+    parser.add_argument("--words", type=int, default=500,
+                        help="Words per record (PreprocessConfig.max_text_length)")
+    parser.add_argument("--records", type=int, default=1000,
+                        help="Number of synthetic records")
+    parser.add_argument("--repeats", type=int, default=5,
+                        help="Timing repeats (best is reported)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Random seed")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4],
+                        help="Worker counts for the parallel benchmark")
+    parser.add_argument("--chunk-size", type=int, default=250,
+                        help="Texts per worker task for the parallel benchmark")
+    parser.add_argument("--goal-patterns", type=int, nargs="+", default=[11, 200, 1000],
+                        help="Pattern counts for the goal pattern benchmark")
+
+    args = parser.parse_args()
+
+    samples = load_sample_texts()
+    texts = build_texts(samples, args.records, args.words, args.seed)
+
+    results = {
+        "records": args.records,
+        "words_per_record": args.words,
+        "tokenisation": bench_tokenisation(texts, args.repeats),
+        "batch": bench_batch(texts, args.repeats),
+        "early_exit": bench_early_exit(samples, texts, args.repeats),
+        "parallel": bench_parallel(texts, args.workers, args.chunk_size),
+        "goal_patterns": bench_goal_patterns(
+            samples, texts, args.goal_patterns, args.seed, args.repeats,
+        ),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
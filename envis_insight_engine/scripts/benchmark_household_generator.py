@@ -0,0 +1,87 @@
+"""
+Envis Insight Engine - Household Generator Benchmark
+
+Compares HouseholdGenerator.generate (one household per call from the
+global random sequence) with the batch methods, and checks that batch
+output is bit-identical however the household range is chunked.
+
+Usage:
+    python benchmark_household_generator.py
+    python benchmark_household_generator.py --households 487000 --chunk-size 1000
+"""
+
+import argparse
+import json
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from preprocess import HouseholdGenerator, PreprocessConfig
+
+
+def best_time(fn: Callable[[], object], repeats: int) -> float:
+    """Best-of-``repeats`` wall time of ``fn``, in seconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check_chunking(generator: HouseholdGenerator, n: int, chunkings: List[List[int]]) -> None:
+    """Assert every chunking of households 0..n samples the same arrays."""
+    expected = generator.sample_batch(0, n)
+    for sizes in chunkings:
+        parts, start = [], 0
+        for size in sizes:
+            parts.append(generator.sample_batch(start, size))
+            start += size
+        for name, column in expected.items():
+            assert np.array_equal(column, np.concatenate([part[name] for part in parts])), sizes
+
+
+def bench_generate(n: int, chunk_size: int, repeats: int) -> Dict:
+    generator = HouseholdGenerator(PreprocessConfig())
+    check_chunking(generator, n, [
+        [chunk_size] * (n // chunk_size) + [n % chunk_size],
+        [1] * 100 + [n - 100],
+        [n // 3, n - n // 3],
+    ])
+
+    starts = range(0, n, chunk_size)
+    sequential = best_time(lambda: [generator.generate() for _ in range(n)], repeats)
+    batch = best_time(
+        lambda: [generator.generate_batch(s, min(chunk_size, n - s)) for s in starts], repeats,
+    )
+    arrays = best_time(
+        lambda: [generator.sample_batch(s, min(chunk_size, n - s)) for s in starts], repeats,
+    )
+    return {
+        "households": n,
+        "chunk_size": chunk_size,
+        "generate_per_second": round(n / sequential),
+        "generate_batch_per_second": round(n / batch),
+        "sample_batch_per_second": round(n / arrays),
+        "generate_batch_speedup": round(sequential / batch, 2),
+        "sample_batch_speedup": round(sequential / arrays, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the household generator")
+    parser.add_argument("--households", type=int, default=100_000,
+                        help="Number of households to generate")
+    parser.add_argument("--chunk-size", type=int, default=1000,
+                        help="Households per batch call")
+    parser.add_argument("--repeats", type=int, default=3,
+                        help="Timing repeats (best is reported)")
+
+    args = parser.parse_args()
+
+    print(json.dumps(bench_generate(args.households, args.chunk_size, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Envis Insight Engine - Record Scanner Benchmark
+
+Checks that RecordScanner.scan gives exactly the result of the original
+fused scan, in which every household keyword was one more branch of the
+exclusion and goal alternation, and times both as the keyword vocabulary
+grows. Keywords now come from the filter's keyword automaton, so the
+scan cost should stay flat while the reference grows with the vocabulary.
+
+Vocabularies past the built-in keyword table are filled with one- and
+two-word phrases drawn from the labelled samples, so a share of them hit.
+
+Usage:
+    python benchmark_record_scanner.py
+    python benchmark_record_scanner.py --keywords 21 1000 5000 --records 500 --repeats 3
+"""
+
+import argparse
+import json
+import random
+import re
+from typing import Dict, List
+
+from benchmark_household_filter import build_texts, load_sample_texts, time_per_record
+from household_filter import HOUSEHOLD_KEYWORDS, HouseholdFilter, HouseholdFilterConfig
+from preprocess import GoalPatternSet, PreprocessConfig, RecordScanner, ScanResult
+
+
+class ReferenceRecordScanner(RecordScanner):
+    """The original fused scan, with one alternation branch per keyword."""
+
+    def __init__(self, exclusions: List[Dict], household_filter: HouseholdFilter):
+        super().__init__(exclusions, household_filter)
+        branches = self._patterns.patterns[:self._goal_offset]
+        keywords = household_filter.keywords
+        if household_filter.config.keyword_word_boundaries:
+            keyword_branches = [rf'(?<!\w){re.escape(k)}(?!\w)' for k, _ in keywords]
+        else:
+            keyword_branches = [re.escape(k) for k, _ in keywords]
+        self._keyword_offset = len(branches)
+        self._goal_offset = self._keyword_offset + len(keyword_branches)
+        self._patterns = GoalPatternSet(
+            branches + keyword_branches + household_filter.goal_patterns
+        )
+
+    def scan(self, text: str) -> ScanResult:
+        hits = self._patterns.find(text.lower())
+
+        found = set()
+        if self.min_words:
+            word_count = len(text.split())
+            found.update(
+                reason for reason, min_words in self.min_words.items()
+                if word_count < min_words
+            )
+        split = 0
+        while split < len(hits) and hits[split] < self._keyword_offset:
+            found.add(self._branch_reasons[hits[split]])
+            split += 1
+
+        for reason in self.reasons:
+            if reason in found:
+                return ScanResult(exclusion_reason=reason, household=None)
+
+        keyword_hits = [h - self._keyword_offset for h in hits if h < self._goal_offset]
+        goal_hits = [h - self._goal_offset for h in hits if h >= self._goal_offset]
+        household = self.household_filter.score_from_hits(text, keyword_hits, goal_hits)
+        return ScanResult(exclusion_reason=None, household=household)
+
+
+def build_keywords(samples: List[str], n_keywords: int, seed: int) -> Dict[str, float]:
+    """The built-in keywords, padded to ``n_keywords`` with sample phrases."""
+    rng = random.Random(seed)
+    words = sorted({word for sample in samples for word in re.findall(r"[a-z']+", sample.lower())})
+    keywords = dict(HOUSEHOLD_KEYWORDS)
+    while len(keywords) < n_keywords:
+        phrase = rng.choice(words)
+        if rng.random() < 0.7:
+            phrase += " " + rng.choice(words)
+        keywords.setdefault(phrase, round(rng.uniform(0.3, 1.0), 2))
+    return keywords
+
+
+def bench_vocabulary(
+    texts: List[str],
+    keywords: Dict[str, float],
+    word_boundaries: bool,
+    repeats: int,
+) -> Dict:
+    """Equivalence against the reference scan, then per-record timings."""
+    household_filter = HouseholdFilter(
+        HouseholdFilterConfig(keyword_word_boundaries=word_boundaries), keywords=keywords,
+    )
+    exclusions = PreprocessConfig().exclusions
+    scanner = RecordScanner(exclusions, household_filter)
+    reference = ReferenceRecordScanner(exclusions, household_filter)
+
+    for text in texts:
+        assert scanner.scan(text) == reference.scan(text), repr(text[:80])
+
+    reference_us = time_per_record(reference.scan, texts, repeats)
+    scan_us = time_per_record(scanner.scan, texts, repeats)
+    return {
+        "keywords": len(keywords),
+        "reference_us_per_record": round(reference_us, 1),
+        "scan_us_per_record": round(scan_us, 1),
+        "speedup": round(reference_us / scan_us, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RecordScanner.scan")
+    parser.add_argument("--keywords", type=int, nargs="+", default=[21, 500, 3000],
+                        help="Keyword vocabulary sizes")
+    parser.add_argument("--words", type=int, default=500,
+                        help="Words per record (PreprocessConfig.max_text_length)")
+    parser.add_argument("--records", type=int, default=100,
+                        help="Number of synthetic records")
+    parser.add_argument("--repeats", type=int, default=1,
+                        help="Timing repeats (best is reported)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Random seed")
+
+    args = parser.parse_args()
+
+    samples = load_sample_texts()
+    texts = samples + build_texts(samples, args.records, args.words, args.seed)
+    results = {}
+    for word_boundaries in (False, True):
+        results["whole_word" if word_boundaries else "substring"] = [
+            bench_vocabulary(
+                texts, build_keywords(samples, n, args.seed), word_boundaries, args.repeats,
+            )
+            for n in args.keywords
+        ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
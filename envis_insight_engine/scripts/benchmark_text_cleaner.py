@@ -0,0 +1,132 @@
+"""
+Envis Insight Engine - Text Cleaner Benchmark
+
+Checks that TextCleaner.clean produces exactly the output of the original
+implementation and measures the speed-up, on records assembled from the
+Reddit-style labelled samples in data/samples/.
+
+Records are built from sample words with URLs, emoji, symbols and
+irregular whitespace mixed in, so every cleaning step has work to do.
+Record lengths straddle min_text_length and max_text_length, exercising
+both the exclusion and the truncation paths.
+
+Usage:
+    python benchmark_text_cleaner.py
+    python benchmark_text_cleaner.py --records 5000 --words 800 --repeats 5
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from typing import Dict, List, Optional
+
+from benchmark_household_filter import load_sample_texts, time_per_record
+from preprocess import PreprocessConfig, TextCleaner
+
+NOISE = [
+    "https://www.reddit.com/r/UKPersonalFinance/comments/abc123",
+    "www.moneysavingexpert.com/banking",
+    "\U0001F605", "\U0001F4B8\U0001F4B8", "&amp;", "#budget", "@partner",
+    "**", "~~", ">", "|", ":)", "£1,200", "$50", "€30", " ", "\t", "\n\n",
+]
+
+
+class ReferenceTextCleaner:
+    """The original TextCleaner.clean, kept as the benchmark baseline."""
+
+    URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+    SPECIAL_CHARS = re.compile(r'[^\w\s£$€\-.,!?\'"()]')
+    WHITESPACE = re.compile(r'\s+')
+
+    def __init__(self, config: PreprocessConfig):
+        self.config = config
+
+    def clean(self, text: str) -> Optional[str]:
+        if not text or not isinstance(text, str):
+            return None
+        if self.config.remove_urls:
+            text = self.URL_PATTERN.sub('', text)
+        text = self.SPECIAL_CHARS.sub(' ', text)
+        text = self.WHITESPACE.sub(' ', text).strip()
+        if self.config.lowercase:
+            text = text.lower()
+        word_count = len(text.split())
+        if word_count < self.config.min_text_length:
+            return None
+        if word_count > self.config.max_text_length:
+            words = text.split()[:self.config.max_text_length]
+            text = ' '.join(words)
+        return text
+
+
+def build_noisy_texts(samples: List[str], n_records: int, max_words: int, seed: int) -> List[str]:
+    """Records of 1..``max_words`` sample words with noise tokens mixed in."""
+    rng = random.Random(seed)
+    words = [word for sample in samples for word in sample.split()]
+    records = []
+    for _ in range(n_records):
+        n_words = rng.randint(1, max_words)
+        parts = []
+        for _ in range(n_words):
+            parts.append(rng.choice(NOISE) if rng.random() < 0.1 else rng.choice(words))
+            parts.append(rng.choice(["", " ", "  ", "\n"]) if rng.random() < 0.1 else " ")
+        records.append("".join(parts))
+    return records
+
+
+def bench_clean(texts: List[str], repeats: int) -> Dict:
+    """Equivalence against the original, then per-record and batch timings."""
+    config = PreprocessConfig()
+    cleaner = TextCleaner(config)
+    reference = ReferenceTextCleaner(config)
+
+    for text in texts:
+        assert cleaner.clean(text) == reference.clean(text), repr(text)
+
+    reference_us = time_per_record(reference.clean, texts, repeats)
+    clean_us = time_per_record(cleaner.clean, texts, repeats)
+
+    best_batch = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        cleaner.clean_batch(texts)
+        best_batch = min(best_batch, time.perf_counter() - start)
+    batch_us = best_batch / len(texts) * 1e6
+
+    return {
+        "records": len(texts),
+        "kept": len(cleaner.clean_batch(texts)),
+        "reference_us_per_record": round(reference_us, 1),
+        "clean_us_per_record": round(clean_us, 1),
+        "clean_batch_us_per_record": round(batch_us, 1),
+        "speedup": round(reference_us / clean_us, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TextCleaner.clean")
+    parser.add_argument("--records", type=int, default=2000,
+                        help="Number of synthetic noisy records")
+    parser.add_argument("--words", type=int, default=800,
+                        help="Maximum words per synthetic record")
+    parser.add_argument("--repeats", type=int, default=5,
+                        help="Timing repeats (best is reported)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Random seed")
+
+    args = parser.parse_args()
+
+    samples = load_sample_texts()
+    results = {
+        "samples": bench_clean(samples, args.repeats),
+        "noisy": bench_clean(
+            build_noisy_texts(samples, args.records, args.words, args.seed), args.repeats,
+        ),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
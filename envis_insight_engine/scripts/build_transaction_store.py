@@ -0,0 +1,89 @@
+"""
+Envis Insight Engine - Transaction Store Builder
+
+Converts a transaction export (CSV or JSON lines, one transaction per row)
+into the columnar, memory-mapped store read by TransactionStore (see
+src/transaction_store.py), sorted by household and time.
+
+Pass --vocab with the meta.json of an existing store to encode a new feed
+with the same category and merchant ids the model was trained on.
+
+Usage:
+    python build_transaction_store.py --input transactions.csv --output data/transactions/
+    python build_transaction_store.py --input feed.jsonl --output data/feed_store/ \\
+        --vocab data/transactions/meta.json --household-field account_id
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from transaction_store import write_transaction_store  # noqa: E402
+
+
+def read_transactions(path: str, fields: Dict[str, str]) -> Iterator[Dict]:
+    """Yield transactions from a CSV or JSON lines file, renamed to store fields."""
+    with open(path, newline='') as f:
+        if path.endswith(".csv"):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for row in rows:
+            transaction = {name: row[source] for name, source in fields.items()}
+            transaction["amount"] = float(transaction["amount"])
+            if isinstance(transaction["timestamp"], str) and transaction["timestamp"].isdigit():
+                transaction["timestamp"] = int(transaction["timestamp"])
+            yield transaction
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a columnar transaction store")
+    parser.add_argument("--input", type=str, required=True,
+                        help="Transactions as .csv or .jsonl")
+    parser.add_argument("--output", type=str, required=True,
+                        help="Store directory")
+    parser.add_argument("--vocab", type=str, default=None,
+                        help="meta.json of a store whose category/merchant ids to reuse")
+    parser.add_argument("--household-field", type=str, default="household_id")
+    parser.add_argument("--timestamp-field", type=str, default="timestamp",
+                        help="Epoch seconds or ISO 8601 date/time")
+    parser.add_argument("--amount-field", type=str, default="amount")
+    parser.add_argument("--category-field", type=str, default="category")
+    parser.add_argument("--merchant-field", type=str, default="merchant")
+
+    args = parser.parse_args()
+
+    fields = {
+        "household_id": args.household_field,
+        "timestamp": args.timestamp_field,
+        "amount": args.amount_field,
+        "category": args.category_field,
+        "merchant": args.merchant_field,
+    }
+    vocab = {}
+    if args.vocab:
+        with open(args.vocab) as f:
+            meta = json.load(f)
+        vocab = {
+            "category_vocab": meta["category_vocab"],
+            "merchant_vocab": meta["merchant_vocab"],
+        }
+
+    start = time.perf_counter()
+    meta = write_transaction_store(
+        Path(args.output), read_transactions(args.input, fields), **vocab,
+    )
+    elapsed = time.perf_counter() - start
+    print(f"{meta['transactions']} transactions from {meta['households']} households "
+          f"written to {args.output} in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Envis Insight Engine - Append Crash Recovery Check
+
+Interrupts PreprocessingPipeline.append at its last writes (after the
+dedup state is saved, and after every state file is saved but before
+stats.json), retries it, and asserts the output matches a full run over
+the same input: split records, household components, graph ids and
+counts. Runs both output layouts, with the hash split and batch household
+generation that make base + append equal to a full run.
+
+Usage:
+    python check_append_recovery.py
+    python check_append_recovery.py --records 5000 --append-records 2000
+"""
+
+import argparse
+import json
+import random
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+import preprocess
+from benchmark_household_filter import load_sample_texts
+from household_filter import load_components
+from household_graph import HouseholdGraphStore
+from preprocess import SPLITS, PreprocessConfig, PreprocessingPipeline, iter_split_records
+
+
+class SimulatedCrash(Exception):
+    pass
+
+
+def build_texts(n: int, seed: int) -> List[str]:
+    """Random texts over the sample vocabulary, mostly distinct."""
+    words = " ".join(load_sample_texts()).split()
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(12, 60))) for _ in range(n)]
+
+
+def snapshot(output_dir: Path) -> Dict:
+    """Everything an append must reproduce, read through stats.json."""
+    with open(output_dir / "stats.json") as f:
+        stats = json.load(f)
+    components = [load_components(output_dir / name) for name in stats.get(
+        "component_files", [preprocess.COMPONENTS_FILE])]
+    index = np.concatenate([block[0] for block in components])
+    order = np.argsort(index)
+    graphs = HouseholdGraphStore.load(output_dir / stats["graphs_file"])
+    return {
+        "records": {split: list(iter_split_records(output_dir, split)) for split in SPLITS},
+        "index": index[order],
+        "components": np.concatenate([block[1] for block in components])[order],
+        "graph_records": {split: len(graphs.record_graphs.get(split, ())) for split in SPLITS},
+        "counts": {key: stats[key] for key in (
+            "input_records", "after_dedup", "after_filtering",
+            "train_records", "val_records", "test_records", "dedup",
+        )},
+    }
+
+
+def crash_in(target, name: str, calls_before_crash: int = 0):
+    """Patch ``target.name`` to raise after ``calls_before_crash`` calls; returns an undo."""
+    original = getattr(target, name)
+    calls = [0]
+
+    def patched(*args, **kwargs):
+        calls[0] += 1
+        if calls[0] > calls_before_crash:
+            raise SimulatedCrash(name)
+        return original(*args, **kwargs)
+
+    setattr(target, name, patched)
+    return lambda: setattr(target, name, original)
+
+
+def check(stream: bool, base: List[str], extra: List[str], workdir: Path) -> None:
+    config = PreprocessConfig()
+    config.split_method = "hash"
+    config.generation_method = "batch"
+    pipeline = PreprocessingPipeline(config)
+
+    def initial(output_dir: Path, texts: List[str]) -> None:
+        if stream:
+            pipeline.run_stream(iter(texts), str(output_dir), shard_size=1000)
+        else:
+            pipeline.run(texts, str(output_dir))
+
+    full_dir = workdir / "full"
+    initial(full_dir, base + extra)
+    expected = snapshot(full_dir)
+
+    crashes = [
+        (HouseholdGraphStore, "save"),               # dedup state saved, graphs not
+        (preprocess, "_write_stats"),                # all state saved, stats.json not
+    ]
+    for i, (target, name) in enumerate(crashes):
+        output_dir = workdir / f"append-{i}"
+        initial(output_dir, base)
+        undo = crash_in(target, name)
+        try:
+            pipeline.append(iter(extra), str(output_dir), shard_size=1000)
+            raise AssertionError("append was not interrupted")
+        except SimulatedCrash:
+            pass
+        finally:
+            undo()
+        pipeline.append(iter(extra), str(output_dir), shard_size=1000)
+
+        actual = snapshot(output_dir)
+        layout = "stream" if stream else "batch"
+        assert actual["records"] == expected["records"], (layout, name)
+        assert np.array_equal(actual["index"], expected["index"]), (layout, name)
+        assert np.array_equal(actual["components"], expected["components"]), (layout, name)
+        assert actual["graph_records"] == expected["graph_records"], (layout, name)
+        assert actual["graph_records"] == {
+            split: expected["counts"][f"{split}_records"] for split in SPLITS
+        }, (layout, name)
+        assert actual["counts"] == expected["counts"], (layout, name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that an interrupted append can be retried")
+    parser.add_argument("--records", type=int, default=3000,
+                        help="Records in the initial run")
+    parser.add_argument("--append-records", type=int, default=1500,
+                        help="Records appended")
+    parser.add_argument("--seed", type=int, default=7)
+
+    args = parser.parse_args()
+
+    texts = build_texts(args.records + args.append_records, args.seed)
+    base, extra = texts[:args.records], texts[args.records:]
+    # Repeats of earlier records, which the retried append must still drop
+    extra += base[:args.append_records // 10]
+    results = {}
+    for stream in (False, True):
+        with tempfile.TemporaryDirectory() as workdir:
+            check(stream, base, extra, Path(workdir))
+        results["stream" if stream else "batch"] = "ok"
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,28 +6,95 @@ Processes raw data from multiple sources into training-ready format.
 Pipeline stages:
 1. Load raw data from sources
 2. Clean and normalise text
-3. Apply household relevance filtering
-4. Generate synthetic household structures
-5. Split into train/val/test
-6. Save processed dataset
+3. Remove exact and near-duplicate records (streaming MinHash/LSH)
+4. Apply exclusion criteria and household relevance filtering (one fused scan)
+5. Generate synthetic household structures
+6. Split into train/val/test
+7. Save processed dataset, with each distinct household structure encoded
+   once as graph tensors (household_graphs.npz)
+
+With --stream, records are read incrementally from JSONL or CSV, pushed
+through cleaning, filtering and household generation one at a time, and
+written as compact JSONL shards, so peak memory does not grow with input.
+
+With --workers N, cleaning and the exclusion/household scan run on a
+process pool in chunks; household generation and splitting stay in input
+order in the main process, so output is identical for any worker count.
+
+With --cache-dir, each completed stage is stored under a key derived from
+the input and the config fields it depends on; reruns skip unchanged
+stages and resume after the last completed one.
+
+With --append, only the records in --input are processed and added to an
+existing output directory (either layout). They are deduplicated against
+the saved dedup state, assigned splits by a seeded hash of their record id
+so earlier records never move, and stats.json is updated from its stored
+totals without rereading old data. stats.json is replaced last and names
+the live state files, so an interrupted append can simply be retried.
 
 Usage:
-    python preprocess.py --config config/preprocess_config.yaml --output data/processed/
+    python preprocess.py --input raw.json --output data/processed/
+    python preprocess.py --input raw.json --output data/processed/ --cache-dir data/cache/
+    python preprocess.py --input raw.jsonl --output data/processed/ --workers 4
+    python preprocess.py --config config/preprocess_config.yaml --input raw.json --output data/processed/
+    python preprocess.py --stream --input raw.jsonl --output data/processed/ --shard-size 100000
+    python preprocess.py --append --input new_month.jsonl --output data/processed/
 """
 
 import argparse
+import hashlib
 import json
+import os
+import pickle
 import re
 import random
+import sys
+import time
+import zlib
+from array import array
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Optional
 from datetime import datetime
 import csv
 
+import numpy as np
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from household_filter import (  # noqa: E402
+    FilterResult,
+    GoalPatternSet,
+    HouseholdFilter,
+    HouseholdFilterConfig,
+    save_components,
+)
+from household_graph import HouseholdGraphStore  # noqa: E402
+
 # In production:
 # import pandas as pd
-# from household_filter import HouseholdFilter
+
+
+# Columnar household signal sidecar written next to the processed splits
+COMPONENTS_FILE = "household_components.npz"
+
+# Deduplicator tables saved with the outputs, so --append can drop
+# duplicates of earlier records without rereading them
+DEDUP_STATE_FILE = "dedup_state.npz"
+
+# Distinct household graphs and per-split record -> graph ids, for the
+# HouseholdEncoder data loader
+GRAPHS_FILE = "household_graphs.npz"
+
+# Each append writes the two state files above under a new generation name
+# and stats.json switches to them (dedup_state_file, graphs_file), so
+# stats.json is the one commit point of an append
+
+SPLITS = ("train", "val", "test")
 
 
 @dataclass
@@ -46,15 +113,29 @@ class PreprocessConfig:
     
     # Filtering
     household_threshold: float = 0.4
+    household_weights: Dict = None
+    
+    # Exclusion criteria (see exclusions in preprocess_config.yaml)
+    exclusions: List[Dict] = None
+    
+    # Duplicate removal
+    dedup_exact: bool = True
+    dedup_near: bool = True
+    shingle_size: int = 3
+    num_permutations: int = 32
+    lsh_bands: int = 4
     
     # Household generation
     household_distribution: Dict = None
+    generation_method: str = "sequential"  # or "batch"
     
     # Splitting
     train_ratio: float = 0.8
     val_ratio: float = 0.1
     test_ratio: float = 0.1
     stratify_by: str = "distress_label"
+    split_method: str = "shuffle"  # or "hash"
+    household_leak_prevention: bool = True
     
     # Random seed
     seed: int = 42
@@ -69,6 +150,71 @@ class PreprocessConfig:
                 "single_parent": 0.10,
                 "multi_generational": 0.05,
             }
+        if self.household_weights is None:
+            self.household_weights = {
+                "keyword": 0.40,
+                "pronoun_ratio": 0.20,
+                "shared_goal_pattern": 0.25,
+                "multi_person_reference": 0.15,
+            }
+        if self.exclusions is None:
+            self.exclusions = [
+                {"type": "crisis_indicators",
+                 "patterns": ["suicide", "self-harm", "kill myself", "end it all"]},
+                {"type": "spam",
+                 "patterns": ["click here", "limited offer", "act now"]},
+                {"type": "too_short", "min_words": 10},
+            ]
+    
+    @classmethod
+    def from_yaml(cls, path: str) -> 'PreprocessConfig':
+        """Load configuration from a preprocess_config.yaml file."""
+        with open(path) as f:
+            raw = yaml.safe_load(f) or {}
+        
+        cleaning = raw.get('cleaning', {})
+        filtering = raw.get('filtering', {})
+        generation = raw.get('household_generation', {})
+        dedup = raw.get('dedup', {})
+        splitting = raw.get('splitting', {})
+        defaults = cls()
+        
+        return cls(
+            min_text_length=cleaning.get('min_text_length', defaults.min_text_length),
+            max_text_length=cleaning.get('max_text_length', defaults.max_text_length),
+            remove_urls=cleaning.get('remove_urls', defaults.remove_urls),
+            lowercase=cleaning.get('lowercase', defaults.lowercase),
+            household_threshold=filtering.get('threshold', defaults.household_threshold),
+            household_weights=filtering.get('weights'),
+            exclusions=raw.get('exclusions'),
+            dedup_exact=dedup.get('exact', defaults.dedup_exact),
+            dedup_near=dedup.get('near', defaults.dedup_near),
+            shingle_size=dedup.get('shingle_size', defaults.shingle_size),
+            num_permutations=dedup.get('num_permutations', defaults.num_permutations),
+            lsh_bands=dedup.get('bands', defaults.lsh_bands),
+            household_distribution=generation.get('distribution'),
+            generation_method=generation.get('method', defaults.generation_method),
+            train_ratio=splitting.get('train_ratio', defaults.train_ratio),
+            val_ratio=splitting.get('val_ratio', defaults.val_ratio),
+            test_ratio=splitting.get('test_ratio', defaults.test_ratio),
+            stratify_by=splitting.get('stratify_by', defaults.stratify_by),
+            split_method=splitting.get('method', defaults.split_method),
+            household_leak_prevention=splitting.get(
+                'household_leak_prevention', defaults.household_leak_prevention,
+            ),
+            seed=raw.get('seed', defaults.seed),
+        )
+    
+    def household_filter_config(self) -> HouseholdFilterConfig:
+        """HouseholdFilterConfig for the configured threshold and weights."""
+        weights = self.household_weights
+        return HouseholdFilterConfig(
+            keyword_weight=weights["keyword"],
+            pronoun_weight=weights["pronoun_ratio"],
+            shared_goal_weight=weights["shared_goal_pattern"],
+            multi_person_weight=weights["multi_person_reference"],
+            relevance_threshold=self.household_threshold,
+        )
 
 
 class TextCleaner:
@@ -78,6 +224,11 @@ class TextCleaner:
     SPECIAL_CHARS = re.compile(r'[^\w\s£$€\-.,!?\'"()]')
     WHITESPACE = re.compile(r'\s+')
     
+    # Runs of special characters. Each special character becomes a space
+    # and whitespace runs are collapsed afterwards, so replacing a whole
+    # run with one space gives the same text with fewer substitutions.
+    SPECIAL_CHAR_RUNS = re.compile(r'[^\w\s£$€\-.,!?\'"()]+')
+    
     def __init__(self, config: PreprocessConfig):
         self.config = config
     
@@ -90,39 +241,363 @@ class TextCleaner:
         if not text or not isinstance(text, str):
             return None
         
-        # Remove URLs
-        if self.config.remove_urls:
+        # Remove URLs (the substring checks skip the regex for most records)
+        if self.config.remove_urls and ('http' in text or 'www.' in text):
             text = self.URL_PATTERN.sub('', text)
         
-        # Remove special characters (keep currency symbols)
-        text = self.SPECIAL_CHARS.sub(' ', text)
-        
-        # Normalise whitespace
-        text = self.WHITESPACE.sub(' ', text).strip()
-        
-        # Lowercase
-        if self.config.lowercase:
-            text = text.lower()
+        # Remove special characters (keep currency symbols), then split once:
+        # str.split() uses the same whitespace definition as \s, so the
+        # words serve for whitespace normalisation, counting and truncation
+        words = self.SPECIAL_CHAR_RUNS.sub(' ', text).split()
         
         # Length check
-        word_count = len(text.split())
+        word_count = len(words)
         if word_count < self.config.min_text_length:
             return None
         if word_count > self.config.max_text_length:
             # Truncate to max length
-            words = text.split()[:self.config.max_text_length]
-            text = ' '.join(words)
+            words = words[:self.config.max_text_length]
+        text = ' '.join(words)
+        
+        # Lowercase (never adds or removes whitespace, so it can follow
+        # the word count)
+        if self.config.lowercase:
+            text = text.lower()
         
         return text
     
     def clean_batch(self, texts: List[str]) -> List[Tuple[int, str]]:
         """Clean a batch of texts, returning (index, cleaned_text) pairs."""
-        results = []
+        return list(self.clean_stream(texts))
+    
+    def clean_stream(self, texts: Iterable[str]) -> Iterator[Tuple[int, str]]:
+        """Lazily clean texts, yielding (index, cleaned_text) for those kept."""
+        clean = self.clean
         for i, text in enumerate(texts):
-            cleaned = self.clean(text)
+            cleaned = clean(text)
             if cleaned:
-                results.append((i, cleaned))
-        return results
+                yield i, cleaned
+
+
+class HashIndex:
+    """
+    Open-addressing map from 64-bit hashes to record indices.
+    
+    Keys and values live in two flat typed arrays (16 bytes a slot, at
+    most 70% full), so memory grows by a few dozen bytes per entry with
+    no per-entry Python objects. Key 0 marks an empty slot.
+    """
+    
+    MAX_LOAD = 0.7
+    
+    def __init__(self, capacity: int = 1 << 16):
+        self._allocate(capacity)
+        self.size = 0
+    
+    def _allocate(self, capacity: int) -> None:
+        self._keys = array('Q', bytes(8 * capacity))
+        self._values = array('q', bytes(8 * capacity))
+        self._mask = capacity - 1
+        self._limit = int(capacity * self.MAX_LOAD)
+    
+    def get(self, key: int) -> Optional[int]:
+        key = key or 1
+        keys, mask = self._keys, self._mask
+        slot = key & mask
+        while True:
+            found = keys[slot]
+            if found == key:
+                return self._values[slot]
+            if not found:
+                return None
+            slot = (slot + 1) & mask
+    
+    def put(self, key: int, value: int) -> None:
+        key = key or 1
+        keys, mask = self._keys, self._mask
+        slot = key & mask
+        while keys[slot] and keys[slot] != key:
+            slot = (slot + 1) & mask
+        if not keys[slot]:
+            keys[slot] = key
+            self.size += 1
+        self._values[slot] = value
+        if self.size > self._limit:
+            self._grow()
+    
+    def _grow(self) -> None:
+        old_keys, old_values = self._keys, self._values
+        self._allocate(2 * len(old_keys))
+        self.size = 0
+        for key, value in zip(old_keys, old_values):
+            if key:
+                self.put(key, value)
+    
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The raw key and value tables, as zero-copy NumPy views."""
+        return (
+            np.frombuffer(self._keys, dtype=np.uint64),
+            np.frombuffer(self._values, dtype=np.int64),
+        )
+    
+    @classmethod
+    def from_arrays(cls, keys: np.ndarray, values: np.ndarray) -> 'HashIndex':
+        """Rebuild an index from tables returned by ``to_arrays``."""
+        index = cls.__new__(cls)
+        index._keys = array('Q', np.ascontiguousarray(keys, dtype=np.uint64).tobytes())
+        index._values = array('q', np.ascontiguousarray(values, dtype=np.int64).tobytes())
+        index._mask = len(keys) - 1
+        index._limit = int(len(keys) * cls.MAX_LOAD)
+        index.size = int(np.count_nonzero(keys))
+        return index
+
+
+class Deduplicator:
+    """
+    Streaming exact and near-duplicate detection over cleaned texts.
+    
+    Exact duplicates share a 64-bit BLAKE2b hash of the cleaned text. Near
+    duplicates are found with MinHash over word shingles and LSH banding:
+    signatures of ``num_permutations`` values are cut into ``lsh_bands``
+    bands, and a record whose band hash matches any earlier kept record is
+    dropped as a near duplicate of it. The first record of each cluster is
+    kept.
+    
+    ``fingerprint`` is a pure function of the text (it can run in worker
+    processes); ``is_duplicate`` must see records in input order. Only
+    hashes of kept records are stored, in HashIndex tables, so memory is
+    about 160 bytes per distinct record (five 16-byte slots at 35-70% load).
+    Representatives of duplicate clusters are kept the same way, keyed by
+    index + 1 (key 0 marks an empty slot).
+    """
+    
+    _MIX = np.uint64(0x9E3779B97F4A7C15)
+    
+    def __init__(self, config: PreprocessConfig):
+        if config.num_permutations % config.lsh_bands:
+            raise ValueError(
+                f"num_permutations ({config.num_permutations}) must be a "
+                f"multiple of lsh_bands ({config.lsh_bands})"
+            )
+        self.exact = config.dedup_exact
+        self.near = config.dedup_near
+        self._params = {
+            name: getattr(config, name)
+            for name in ("dedup_exact", "dedup_near", "shingle_size",
+                         "num_permutations", "lsh_bands", "seed")
+        }
+        self.shingle_size = config.shingle_size
+        self.bands = config.lsh_bands
+        
+        # Fixed hash parameters, so fingerprints are identical across
+        # processes and runs. Odd multipliers make each a*x + b (mod 2^64)
+        # a permutation of the 64-bit hash space.
+        rng = np.random.default_rng(config.seed)
+        def odd(n):
+            return rng.integers(0, 2**63, size=n, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._shingle_mix = odd(self.shingle_size)
+        self._perm_a = odd(config.num_permutations)[:, None]
+        self._perm_b = rng.integers(0, 2**63, size=config.num_permutations, dtype=np.uint64)[:, None]
+        rows = config.num_permutations // self.bands
+        self._row_mix = odd(rows)
+        self._band_salt = odd(self.bands)
+        
+        self._exact_index = HashIndex()
+        self._band_index = HashIndex()
+        self._clusters = HashIndex()
+        self.stats = {"exact_duplicates": 0, "near_duplicates": 0}
+    
+    @property
+    def enabled(self) -> bool:
+        return self.exact or self.near
+    
+    def fingerprint(self, text: str) -> Tuple[int, List[int]]:
+        """Exact hash and LSH band hashes (empty if near dedup is off)."""
+        exact = int.from_bytes(
+            hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little',
+        )
+        if not self.near:
+            return exact, []
+        
+        words = text.split()
+        word_hashes = np.fromiter(
+            (zlib.crc32(word.encode('utf-8')) for word in words),
+            dtype=np.uint64, count=len(words),
+        )
+        k = min(self.shingle_size, len(words)) or 1
+        n_shingles = max(len(words) - k + 1, 1)
+        shingles = np.zeros(n_shingles, dtype=np.uint64)
+        for j in range(k):
+            shingles += word_hashes[j:j + n_shingles] * self._shingle_mix[j]
+        
+        signature = (self._perm_a * shingles + self._perm_b).min(axis=1)
+        bands = (signature.reshape(self.bands, -1) * self._row_mix).sum(axis=1)
+        bands = (bands ^ (bands >> np.uint64(31))) * self._MIX + self._band_salt
+        return exact, bands.tolist()
+    
+    def is_duplicate(self, idx: int, fingerprint: Tuple[int, List[int]]) -> bool:
+        """
+        Check a record against those seen so far, registering it if kept.
+        
+        Must be called in input order for the output to be deterministic.
+        """
+        exact, bands = fingerprint
+        if self.exact:
+            representative = self._exact_index.get(exact)
+            if representative is not None:
+                self.stats["exact_duplicates"] += 1
+                self._clusters.put(representative + 1, representative)
+                return True
+        
+        for band in bands:
+            representative = self._band_index.get(band)
+            if representative is not None:
+                self.stats["near_duplicates"] += 1
+                self._clusters.put(representative + 1, representative)
+                if self.exact:
+                    # Later exact copies join the same cluster
+                    self._exact_index.put(exact, representative)
+                return True
+        
+        if self.exact:
+            self._exact_index.put(exact, idx)
+        for band in bands:
+            self._band_index.put(band, idx)
+        return False
+    
+    def summary(self) -> Dict[str, int]:
+        """Duplicate counts for stats.json."""
+        return {
+            **self.stats,
+            "removed": self.stats["exact_duplicates"] + self.stats["near_duplicates"],
+            "duplicate_clusters": self._clusters.size,
+        }
+    
+    def save(self, path: Path) -> None:
+        """Write the hash tables, clusters and counts to an .npz file."""
+        exact_keys, exact_values = self._exact_index.to_arrays()
+        band_keys, band_values = self._band_index.to_arrays()
+        cluster_keys, cluster_values = self._clusters.to_arrays()
+        np.savez_compressed(
+            path,
+            params=np.array(json.dumps(self._params)),
+            stats=np.array(json.dumps(self.stats)),
+            exact_keys=exact_keys,
+            exact_values=exact_values,
+            band_keys=band_keys,
+            band_values=band_values,
+            cluster_keys=cluster_keys,
+            cluster_values=cluster_values,
+        )
+    
+    def load(self, path: Path) -> None:
+        """
+        Continue from state written by ``save``.
+        
+        Raises:
+            ValueError: If the state was written with different dedup settings
+        """
+        with np.load(path) as data:
+            if json.loads(str(data['params'])) != self._params:
+                raise ValueError(f"{path} was written with different dedup settings")
+            self.stats = json.loads(str(data['stats']))
+            self._exact_index = HashIndex.from_arrays(data['exact_keys'], data['exact_values'])
+            self._band_index = HashIndex.from_arrays(data['band_keys'], data['band_values'])
+            if 'cluster_keys' in data:
+                self._clusters = HashIndex.from_arrays(data['cluster_keys'], data['cluster_values'])
+            else:
+                # State written before clusters moved to a HashIndex
+                self._clusters = HashIndex()
+                for representative in data['clusters'].tolist():
+                    self._clusters.put(representative + 1, representative)
+
+
+@dataclass
+class ScanResult:
+    """Outcome of the fused exclusion and household scan for one record."""
+    exclusion_reason: Optional[str]
+    household: Optional[FilterResult]
+
+
+class RecordScanner:
+    """
+    Single-pass exclusion and household signal scan.
+    
+    Exclusion phrases and shared goal patterns are fused into one
+    alternation and matched in one scan of the lowercased text; household
+    keywords come from the filter's keyword automaton, whose cost does not
+    grow with the vocabulary. The scan yields the first applicable
+    exclusion reason (in config order) and, for records that are not
+    excluded, the full household FilterResult, built from the scan's
+    keyword and goal hits without rescanning.
+    
+    Exclusion types without patterns or min_words (e.g. non_english) are
+    not applied here.
+    """
+    
+    def __init__(self, exclusions: List[Dict], household_filter: HouseholdFilter):
+        self.household_filter = household_filter
+        self.reasons = []
+        self.min_words: Dict[str, int] = {}
+        self.unsupported: List[str] = []
+        
+        branches = []
+        branch_reasons = []
+        for exclusion in exclusions:
+            reason = exclusion["type"]
+            if exclusion.get("patterns"):
+                for phrase in exclusion["patterns"]:
+                    branches.append(self._phrase_pattern(phrase.lower()))
+                    branch_reasons.append(reason)
+            elif exclusion.get("min_words"):
+                self.min_words[reason] = exclusion["min_words"]
+            else:
+                self.unsupported.append(reason)
+                continue
+            self.reasons.append(reason)
+        
+        self._branch_reasons = branch_reasons
+        self._goal_offset = len(branches)
+        self._patterns = GoalPatternSet(branches + household_filter.goal_patterns)
+    
+    @staticmethod
+    def _phrase_pattern(phrase: str) -> str:
+        """
+        Whole-phrase pattern that keeps a literal first character.
+        
+        The leading boundary is checked by a lookbehind after the first
+        character, so every branch still starts with a literal and the
+        fused regex keeps its first-character prefilter.
+        """
+        if not re.match(r'\w', phrase):
+            return re.escape(phrase)
+        return rf'{re.escape(phrase[0])}(?<!\w.){re.escape(phrase[1:])}(?!\w)'
+    
+    def scan(self, text: str) -> ScanResult:
+        """Scan one (cleaned) record."""
+        lower = text.lower()
+        hits = self._patterns.find(lower)
+        
+        found = set()
+        if self.min_words:
+            word_count = len(text.split())
+            found.update(
+                reason for reason, min_words in self.min_words.items()
+                if word_count < min_words
+            )
+        split = 0
+        while split < len(hits) and hits[split] < self._goal_offset:
+            found.add(self._branch_reasons[hits[split]])
+            split += 1
+        
+        for reason in self.reasons:
+            if reason in found:
+                return ScanResult(exclusion_reason=reason, household=None)
+        
+        keyword_hits = self.household_filter.find_keywords(lower)
+        goal_hits = [h - self._goal_offset for h in hits[split:]]
+        household = self.household_filter.score_from_hits(text, keyword_hits, goal_hits)
+        return ScanResult(exclusion_reason=None, household=household)
 
 
 class HouseholdGenerator:
@@ -182,9 +657,33 @@ class HouseholdGenerator:
     AGE_BRACKETS = ["18-25", "25-35", "35-45", "45-55", "55-65", "65+"]
     INCOME_BRACKETS = ["low", "medium", "high", "unknown"]
     
+    # Age brackets open to each role, as (first, count) in AGE_BRACKETS
+    ROLE_AGES = {"child": (0, 2), "parent": (4, 2)}
+    
+    # Batch mode reserves a fixed block of uniform draws per household: one
+    # for the type plus an age and an income draw per member slot, padded
+    # to whole Philox blocks of four
+    MAX_MEMBERS = 4
+    DRAWS_PER_HOUSEHOLD = 12
+    
     def __init__(self, config: PreprocessConfig):
+        if config.generation_method not in ("sequential", "batch"):
+            raise ValueError(f"Unknown generation_method: {config.generation_method!r}")
         self.config = config
         random.seed(config.seed)
+        
+        self._types = list(config.household_distribution)
+        weights = np.array(list(config.household_distribution.values()), dtype=np.float64)
+        self._type_cdf = np.cumsum(weights / weights.sum())
+        # Per type and member slot: first age bracket and number of
+        # brackets to draw from (0 for an empty slot)
+        self._age_first = np.zeros((len(self._types), self.MAX_MEMBERS), dtype=np.int64)
+        self._age_count = np.zeros((len(self._types), self.MAX_MEMBERS), dtype=np.int64)
+        for t, household_type in enumerate(self._types):
+            for slot, member in enumerate(self.ROLE_CONFIGS[household_type]["members"]):
+                first, count = self.ROLE_AGES.get(member["role"], (0, len(self.AGE_BRACKETS)))
+                self._age_first[t, slot] = first
+                self._age_count[t, slot] = count
     
     def generate(self) -> Dict:
         """Generate a random household structure."""
@@ -219,14 +718,138 @@ class HouseholdGenerator:
             "members": members,
             "relationships": base_config["relationships"],
         }
+    
+    def sample_batch(self, start: int, n: int) -> Dict[str, np.ndarray]:
+        """
+        Sample households ``start`` to ``start + n`` as index arrays.
+        
+        Draws come from a counter-based Philox stream keyed by the seed;
+        household k always uses draws ``k * DRAWS_PER_HOUSEHOLD`` onwards,
+        so any split of the range into chunks, in any process, produces
+        bit-identical households.
+        
+        Returns:
+            Dict of arrays: household_type (n,) indices into the
+            configured distribution; age and income (n, MAX_MEMBERS)
+            indices into AGE_BRACKETS and INCOME_BRACKETS, -1 for empty
+            member slots
+        """
+        bit_generator = np.random.Philox(key=self.config.seed)
+        bit_generator.advance(start * self.DRAWS_PER_HOUSEHOLD // 4)
+        draws = np.random.Generator(bit_generator).random((n, self.DRAWS_PER_HOUSEHOLD))
+        
+        household_type = np.minimum(
+            np.searchsorted(self._type_cdf, draws[:, 0], side='right'), len(self._types) - 1,
+        )
+        age_count = self._age_count[household_type]
+        occupied = age_count > 0
+        age = self._age_first[household_type] + (
+            draws[:, 1:1 + self.MAX_MEMBERS] * age_count
+        ).astype(np.int64)
+        income = (
+            draws[:, 1 + self.MAX_MEMBERS:1 + 2 * self.MAX_MEMBERS] * len(self.INCOME_BRACKETS)
+        ).astype(np.int64)
+        return {
+            "household_type": household_type,
+            "age": np.where(occupied, age, -1),
+            "income": np.where(occupied, income, -1),
+        }
+    
+    def generate_batch(self, start: int, n: int) -> List[Dict]:
+        """Households ``start`` to ``start + n`` in the form ``generate`` returns."""
+        sample = self.sample_batch(start, n)
+        households = []
+        for t, ages, incomes in zip(
+            sample["household_type"].tolist(), sample["age"].tolist(), sample["income"].tolist(),
+        ):
+            household_type = self._types[t]
+            base_config = self.ROLE_CONFIGS[household_type]
+            households.append({
+                "household_type": household_type,
+                "members": [
+                    {
+                        **member,
+                        "age_bracket": self.AGE_BRACKETS[age],
+                        "income_bracket": self.INCOME_BRACKETS[income],
+                    }
+                    for member, age, income in zip(base_config["members"], ages, incomes)
+                ],
+                "relationships": base_config["relationships"],
+            })
+        return households
 
 
 class DataSplitter:
-    """Split data into train/val/test sets with stratification."""
+    """
+    Split data into train/val/test sets.
+    
+    With ``split_method: "shuffle"`` records are shuffled and cut at the
+    configured ratios. With ``"hash"`` each household is assigned on its
+    own from a seeded hash, in one streaming pass with no per-record
+    state: every record of a household lands in the same split, and the
+    assignment never changes as data is appended. Hash mode does not
+    stratify: ``stratify_by`` is ignored, and each label follows the
+    ratios only in expectation, since the hash never sees it.
+    """
+    
+    # Hash buckets; ratios are honoured to 1/HASH_BUCKETS
+    HASH_BUCKETS = 10_000
     
     def __init__(self, config: PreprocessConfig):
+        if config.split_method not in ("shuffle", "hash"):
+            raise ValueError(f"Unknown split_method: {config.split_method!r}")
         self.config = config
         random.seed(config.seed)
+        # Own generator for streaming assignment, independent of the
+        # global sequence used by HouseholdGenerator
+        self._rng = random.Random(config.seed)
+        self._train_buckets = round(config.train_ratio * self.HASH_BUCKETS)
+        self._val_buckets = self._train_buckets + round(config.val_ratio * self.HASH_BUCKETS)
+    
+    def assign(self, record: Dict) -> str:
+        """
+        Split for the next record of a stream.
+        
+        In shuffle mode this is a random draw, so splits follow the
+        configured ratios in expectation rather than exactly, since the
+        total is not known in advance.
+        """
+        if self.config.split_method == "hash":
+            return self.assign_household(record)
+        u = self._rng.random()
+        if u < self.config.train_ratio:
+            return "train"
+        if u < self.config.train_ratio + self.config.val_ratio:
+            return "val"
+        return "test"
+    
+    def assign_household(self, record: Dict, household_id: Optional[str] = None) -> str:
+        """
+        Split for a record from a seeded hash of its household.
+        
+        The household is ``household_id``, else the record's
+        ``household_id`` field, else the record itself (each generated
+        record has its own synthetic household); with
+        ``household_leak_prevention`` off every record is hashed on its
+        own. The key holds nothing but the seed and the household, so all
+        of a household's records share a split even when they carry
+        different ``stratify_by`` labels. The hash is independent of the
+        label, so each stratum still follows the configured ratios in
+        expectation.
+        """
+        if household_id is None:
+            if self.config.household_leak_prevention:
+                household_id = record.get("household_id", record["record_id"])
+            else:
+                household_id = record["record_id"]
+        key = f"{self.config.seed}:{household_id}"
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+        bucket = int.from_bytes(digest, 'little') % self.HASH_BUCKETS
+        if bucket < self._train_buckets:
+            return "train"
+        if bucket < self._val_buckets:
+            return "val"
+        return "test"
     
     def split(
         self, 
@@ -238,6 +861,13 @@ class DataSplitter:
         
         Ensures no household appears in multiple splits.
         """
+        if self.config.split_method == "hash":
+            splits: Dict[str, List[Dict]] = {split: [] for split in SPLITS}
+            for i, record in enumerate(records):
+                household_id = household_ids[i] if household_ids else None
+                splits[self.assign_household(record, household_id)].append(record)
+            return splits["train"], splits["val"], splits["test"]
+        
         # Group by household if provided
         if household_ids:
             # Group records by household
@@ -279,21 +909,330 @@ class DataSplitter:
         return train, val, test
 
 
+class ShardWriter:
+    """
+    Write records as compact JSONL, starting a new shard every ``shard_size`` lines.
+    
+    Shards are numbered from ``first_shard``, so an append continues the
+    existing sequence.
+    """
+    
+    def __init__(self, output_path: Path, name: str, shard_size: int, first_shard: int = 0):
+        self.output_path = output_path
+        self.name = name
+        self.shard_size = shard_size
+        self.first_shard = first_shard
+        self.count = 0
+        self.shards: List[str] = []
+        self._file = None
+    
+    def write(self, record: Dict) -> None:
+        if self.count % self.shard_size == 0:
+            self._open_next()
+        self._file.write(json.dumps(record, separators=(',', ':')))
+        self._file.write('\n')
+        self.count += 1
+    
+    def _open_next(self) -> None:
+        self.close()
+        filename = f"{self.name}-{self.first_shard + len(self.shards):05d}.jsonl"
+        self.shards.append(filename)
+        self._file = open(self.output_path / filename, 'w')
+    
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ComponentWriter:
+    """
+    Collect household component vectors for the rescore sidecar.
+    
+    Without ``shard_size`` everything goes to one COMPONENTS_FILE on close;
+    with it, a household_components-NNNNN.npz is written every
+    ``shard_size`` records so the buffer stays bounded, numbered from
+    ``first_file``.
+    """
+    
+    def __init__(
+        self,
+        output_path: Path,
+        household_filter: HouseholdFilter,
+        shard_size: Optional[int] = None,
+        first_file: int = 0,
+    ):
+        self.output_path = output_path
+        self.household_filter = household_filter
+        self.shard_size = shard_size
+        self.first_file = first_file
+        self.files: List[str] = []
+        self._index: List[int] = []
+        self._components: List[Tuple[float, float, float, float]] = []
+    
+    def add(self, idx: int, household: FilterResult) -> None:
+        self._index.append(idx)
+        self._components.append((
+            household.keyword_score, household.pronoun_ratio,
+            household.shared_goal_score, household.multi_person_score,
+        ))
+        if self.shard_size and len(self._index) >= self.shard_size:
+            self._write()
+    
+    def buffered(self) -> Tuple[List[int], List[Tuple[float, float, float, float]]]:
+        """Copies of the not yet written (index, components) lists."""
+        return list(self._index), list(self._components)
+    
+    def extend(self, index: List[int], components: List[Tuple[float, float, float, float]]) -> None:
+        """Add previously collected vectors (e.g. from the stage cache)."""
+        self._index.extend(index)
+        self._components.extend(components)
+    
+    def _write(self) -> None:
+        if self.shard_size:
+            filename = COMPONENTS_FILE.replace(".npz", f"-{self.first_file + len(self.files):05d}.npz")
+        else:
+            filename = COMPONENTS_FILE
+        save_components(
+            self.output_path / filename, self._index, self._components, self.household_filter,
+        )
+        self.files.append(filename)
+        self._index, self._components = [], []
+    
+    def close(self) -> None:
+        if self._index or not self.shard_size:
+            self._write()
+
+
+class DatasetStats:
+    """
+    Dataset statistics that merge without revisiting records.
+    
+    Text length (words) and household relevance score are kept as count,
+    sum, sum of squares, min and max, so the mean and standard deviation
+    of appended data combine exactly with the stored totals. Medians and
+    deciles would need the old records and are not tracked.
+    """
+    
+    MOMENTS = ("text_length_words", "household_relevance_score")
+    
+    def __init__(self):
+        self.moments = {name: [0, 0.0, 0.0, None, None] for name in self.MOMENTS}
+        self.household_types: Dict[str, int] = {}
+    
+    def add(self, record: Dict) -> None:
+        self._add("text_length_words", len(record["text"].split()))
+        self._add("household_relevance_score", record["household_relevance_score"])
+        household_type = record["household"]["household_type"]
+        self.household_types[household_type] = self.household_types.get(household_type, 0) + 1
+    
+    def _add(self, name: str, value: float) -> None:
+        moment = self.moments[name]
+        moment[0] += 1
+        moment[1] += value
+        moment[2] += value * value
+        moment[3] = value if moment[3] is None else min(moment[3], value)
+        moment[4] = value if moment[4] is None else max(moment[4], value)
+    
+    def merge(self, other: 'DatasetStats') -> None:
+        for name in self.MOMENTS:
+            mine, theirs = self.moments[name], other.moments[name]
+            mine[0] += theirs[0]
+            mine[1] += theirs[1]
+            mine[2] += theirs[2]
+            for i, pick in ((3, min), (4, max)):
+                values = [v for v in (mine[i], theirs[i]) if v is not None]
+                mine[i] = pick(values) if values else None
+        for household_type, count in other.household_types.items():
+            self.household_types[household_type] = self.household_types.get(household_type, 0) + count
+    
+    def to_dict(self) -> Dict:
+        """Section for stats.json; the raw sums are kept so it can be merged later."""
+        data: Dict[str, Any] = {}
+        for name in self.MOMENTS:
+            count, total, total_sq, low, high = self.moments[name]
+            mean = total / count if count else 0.0
+            variance = max(total_sq / count - mean * mean, 0.0) if count else 0.0
+            data[name] = {
+                "count": count,
+                "sum": total,
+                "sum_sq": total_sq,
+                "mean": round(mean, 3),
+                "std": round(variance ** 0.5, 3),
+                "min": low,
+                "max": high,
+            }
+        n_records = sum(self.household_types.values())
+        data["household_type_distribution"] = {
+            household_type: {
+                "count": count,
+                "percentage": round(100 * count / n_records, 1),
+            }
+            for household_type, count in sorted(self.household_types.items())
+        }
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DatasetStats':
+        stats = cls()
+        for name in cls.MOMENTS:
+            entry = data[name]
+            stats.moments[name] = [
+                entry["count"], entry["sum"], entry["sum_sq"], entry["min"], entry["max"],
+            ]
+        stats.household_types = {
+            household_type: entry["count"]
+            for household_type, entry in data["household_type_distribution"].items()
+        }
+        return stats
+
+
+# Stages of PreprocessingPipeline.run that the stage cache stores, in
+# order, and the config fields each one reads
+CACHED_STAGES = ("clean", "filter", "generate", "split")
+STAGE_FIELDS = {
+    "clean": (
+        "min_text_length", "max_text_length", "remove_urls", "lowercase",
+        "dedup_exact", "dedup_near", "shingle_size", "num_permutations", "lsh_bands",
+        "seed",
+    ),
+    "filter": ("exclusions", "household_threshold", "household_weights"),
+    "generate": ("household_distribution", "generation_method", "seed"),
+    "split": (
+        "train_ratio", "val_ratio", "test_ratio", "stratify_by",
+        "split_method", "household_leak_prevention", "seed",
+    ),
+}
+
+
+# Per-run entries of stats.json, never restored from the stage cache
+_RUN_STATS = ("input_records", "timestamp", "config_fingerprint", "stage_cache")
+
+
+class StageCache:
+    """
+    Content-addressed store of pipeline stage outputs.
+    
+    Each entry is a pickle at ``{stage}-{key}.pkl`` under ``root``, where
+    the key hashes the previous stage's key with this stage's config
+    fields, so a change anywhere upstream changes every downstream key.
+    Entries are written to a temporary file and renamed into place, so an
+    interrupted run never leaves a partial entry behind. Entries are
+    trusted local files; do not point the cache at untrusted data.
+    """
+    
+    # Bump when a stage's output format or semantics change
+    VERSION = 3
+    
+    def __init__(self, root: Path):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+    
+    @classmethod
+    def key(cls, parent: str, stage: str, fields: Dict[str, Any]) -> str:
+        state = {"version": cls.VERSION, "parent": parent, "stage": stage, "fields": fields}
+        encoded = json.dumps(state, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()[:32]
+    
+    def path(self, stage: str, key: str) -> Path:
+        return self.root / f"{stage}-{key}.pkl"
+    
+    def completed(self, keys: Dict[str, str]) -> int:
+        """Number of leading stages in CACHED_STAGES with an entry for ``keys``."""
+        done = 0
+        for stage in CACHED_STAGES:
+            if not self.path(stage, keys[stage]).exists():
+                break
+            done += 1
+        return done
+    
+    def load(self, stage: str, key: str) -> Any:
+        with open(self.path(stage, key), 'rb') as f:
+            return pickle.load(f)
+    
+    def save(self, stage: str, key: str, value: Any) -> None:
+        path = self.path(stage, key)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+
+def iter_input_texts(path: str) -> Iterator[str]:
+    """
+    Yield the ``text`` field of each input record.
+    
+    JSONL and CSV are read one line at a time. A .json file holding a
+    ``records`` list has to be loaded whole.
+    """
+    input_path = Path(path)
+    if input_path.suffix == '.jsonl':
+        with open(input_path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line).get("text", "")
+    elif input_path.suffix == '.csv':
+        with open(input_path, newline='') as f:
+            for row in csv.DictReader(f):
+                yield row.get("text", "")
+    elif input_path.suffix == '.json':
+        with open(input_path) as f:
+            data = json.load(f)
+        for record in data.get("records", []):
+            yield record.get("text", "")
+    else:
+        raise ValueError(f"Unsupported input format: {input_path.suffix}")
+
+
+def iter_split_records(output_dir: str, split: str) -> Iterator[Dict]:
+    """
+    Yield the records of one split of a pipeline output directory, in order.
+    
+    Reads {split}.json as written by ``run``, up to the size committed in
+    stats.json (records of an unfinished append are not returned), or the
+    {split}-NNNNN.jsonl shards listed in stats.json by ``run_stream``.
+    """
+    output_path = Path(output_dir)
+    with open(output_path / "stats.json") as f:
+        stats = json.load(f)
+    json_path = output_path / f"{split}.json"
+    if json_path.exists():
+        committed = stats.get("split_file_bytes", {}).get(split, -1)
+        with open(json_path, 'rb') as f:
+            yield from json.loads(f.read(committed))["records"]
+        return
+    for shard in stats["shards"][split]:
+        with open(output_path / shard) as f:
+            for line in f:
+                yield json.loads(line)
+
+
 class PreprocessingPipeline:
     """
     Main preprocessing pipeline.
     
-    Orchestrates all preprocessing steps.
+    Orchestrates all preprocessing steps. Cleaning and scanning run on
+    ``num_workers`` processes in chunks of ``chunk_size`` records; results
+    are consumed in input order, so household generation draws the same
+    random sequence whatever the worker count.
     """
     
-    def __init__(self, config: PreprocessConfig):
+    def __init__(
+        self,
+        config: PreprocessConfig,
+        num_workers: int = 1,
+        chunk_size: int = 1000,
+        cache_dir: Optional[str] = None,
+    ):
         self.config = config
+        self.num_workers = num_workers
+        self.chunk_size = chunk_size
+        self.cache = StageCache(Path(cache_dir)) if cache_dir else None
         self.cleaner = TextCleaner(config)
         self.household_gen = HouseholdGenerator(config)
         self.splitter = DataSplitter(config)
-        
-        # In production:
-        # self.household_filter = HouseholdFilter()
+        self.household_filter = HouseholdFilter(config.household_filter_config())
+        self.scanner = RecordScanner(config.exclusions, self.household_filter)
     
     def run(
         self,
@@ -303,6 +1242,12 @@ class PreprocessingPipeline:
         """
         Run full preprocessing pipeline.
         
+        With a stage cache, every completed stage is stored under a key
+        chained from the input fingerprint and the config fields it reads
+        (STAGE_FIELDS). A rerun resumes after the last stage whose key is
+        unchanged, so a crash while saving or a change to, say, the split
+        ratios does not repeat cleaning and filtering.
+        
         Args:
             raw_texts: List of raw text records
             output_dir: Directory to save processed data
@@ -316,54 +1261,101 @@ class PreprocessingPipeline:
         stats = {
             "input_records": len(raw_texts),
             "timestamp": datetime.utcnow().isoformat() + "Z",
+            "config_fingerprint": self.config_fingerprint(),
         }
         
         print(f"Starting preprocessing pipeline...")
         print(f"Input records: {len(raw_texts)}")
+        start = time.perf_counter()
+        timings = _stage_timings()
+        component_writer = ComponentWriter(output_path, self.household_filter)
         
-        # Step 1: Clean texts
-        print("Step 1: Cleaning texts...")
-        cleaned = self.cleaner.clean_batch(raw_texts)
-        stats["after_cleaning"] = len(cleaned)
-        print(f"  After cleaning: {len(cleaned)}")
-        
-        # Step 2: Household filtering
-        print("Step 2: Applying household filter...")
-        filtered = []
-        for idx, text in cleaned:
-            # In production:
-            # result = self.household_filter.score(text)
-            # if result.is_household_relevant:
-            #     filtered.append((idx, text, result.relevance_score))
-            
-            # Simulated filtering for demo
-            score = self._simulate_household_score(text)
-            if score >= self.config.household_threshold:
-                filtered.append((idx, text, score))
+        keys = self._stage_keys(raw_texts) if self.cache else {}
+        done = self.cache.completed(keys) if self.cache else 0
+        resumed = None
+        if done:
+            last = CACHED_STAGES[done - 1]
+            print(f"Resuming from stage cache after '{last}'")
+            resumed = self.cache.load(last, keys[last])
+            stats.update(resumed["stats"])
+        if self.cache:
+            stats["stage_cache"] = {
+                stage: "hit" if i < done else "miss" for i, stage in enumerate(CACHED_STAGES)
+            }
         
-        stats["after_filtering"] = len(filtered)
-        stats["retention_rate"] = len(filtered) / len(cleaned) if cleaned else 0
-        print(f"  After filtering: {len(filtered)} ({stats['retention_rate']:.1%} retention)")
+        # Step 1: Clean texts, drop duplicates and scan the rest for
+        # exclusions and household signals (one scan per record)
+        print("Step 1: Cleaning, deduplicating and scanning texts...")
+        if done == 0:
+            deduplicator = Deduplicator(self.config)
+            scanned = list(self._scan(raw_texts, timings, deduplicator))
+            stats["after_cleaning"] = timings["dedup_records"]
+            stats["dedup"] = deduplicator.summary()
+            stats["after_dedup"] = len(scanned)
+            self._save_stage("clean", keys, stats, {
+                "unique": [(idx, text) for idx, text, _ in scanned],
+                "deduplicator": deduplicator if deduplicator.enabled else None,
+            })
+        else:
+            entry = resumed if done == 1 else self.cache.load("clean", keys["clean"])
+            deduplicator = entry["deduplicator"]
+            if done == 1:
+                scanned = list(self._scan_unique(entry["unique"], timings))
+            del entry
+        print(f"  After cleaning: {stats['after_cleaning']}")
+        print(f"  After dedup: {stats['after_dedup']} "
+              f"({stats['dedup']['removed']} removed in "
+              f"{stats['dedup']['duplicate_clusters']} clusters)")
+        
+        # Step 2: Exclusions and household filtering
+        print("Step 2: Applying exclusions and household filter...")
+        if self.scanner.unsupported:
+            print(f"  Exclusion types not applied: {', '.join(self.scanner.unsupported)}")
+        if done < 2:
+            excluded: Dict[str, int] = {}
+            filtered = list(self._filter(scanned, excluded, component_writer))
+            del scanned
+            stats["excluded"] = excluded
+            stats["after_filtering"] = len(filtered)
+            stats["retention_rate"] = (
+                len(filtered) / stats["after_dedup"] if stats["after_dedup"] else 0
+            )
+            self._save_stage("filter", keys, stats, {
+                "filtered": filtered,
+                "components": component_writer.buffered(),
+            })
+        else:
+            entry = resumed if done == 2 else self.cache.load("filter", keys["filter"])
+            filtered = entry["filtered"]
+            component_writer.extend(*entry["components"])
+            del entry
+        print(f"  Excluded: {sum(stats['excluded'].values())} {stats['excluded']}")
+        print(f"  After filtering: {stats['after_filtering']} "
+              f"({stats['retention_rate']:.1%} retention)")
         
         # Step 3: Generate household structures
         print("Step 3: Generating household structures...")
-        records = []
-        for idx, text, score in filtered:
-            household = self.household_gen.generate()
-            records.append({
-                "record_id": f"ENS_{idx:05d}",
-                "text": text,
-                "household_relevance_score": round(score, 3),
-                "household": household,
+        if done < 3:
+            records = list(self._generate(filtered, timings))
+            self._save_stage("generate", keys, stats, {
+                "records": records,
+                # The split draws from the same global sequence
+                "random_state": random.getstate(),
             })
+        elif done == 3:
+            records = resumed["records"]
+            random.setstate(resumed["random_state"])
         
         # Step 4: Split data
         print("Step 4: Splitting into train/val/test...")
-        train, val, test = self.splitter.split(records)
-        
-        stats["train_records"] = len(train)
-        stats["val_records"] = len(val)
-        stats["test_records"] = len(test)
+        if done < 4:
+            train, val, test = self.splitter.split(records)
+            stats["train_records"] = len(train)
+            stats["val_records"] = len(val)
+            stats["test_records"] = len(test)
+            self._save_stage("split", keys, stats, {"splits": (train, val, test)})
+        else:
+            train, val, test = resumed["splits"]
         
         print(f"  Train: {len(train)}, Val: {len(val)}, Test: {len(test)}")
         
@@ -379,68 +1371,743 @@ class PreprocessingPipeline:
         with open(output_path / "test.json", 'w') as f:
             json.dump({"records": test}, f, indent=2)
         
-        with open(output_path / "stats.json", 'w') as f:
-            json.dump(stats, f, indent=2)
+        # Component vectors for every scored record, so a new threshold or
+        # weights can be applied with rescore_household.py
+        component_writer.close()
+        if deduplicator is not None and deduplicator.enabled:
+            deduplicator.save(output_path / DEDUP_STATE_FILE)
+            stats["dedup_state_file"] = DEDUP_STATE_FILE
+        
+        graphs = HouseholdGraphStore()
+        for split, records in zip(SPLITS, (train, val, test)):
+            graphs.add_records(split, records)
+        graphs.save(output_path / GRAPHS_FILE)
+        stats["graphs_file"] = GRAPHS_FILE
+        stats["household_graphs"] = len(graphs)
+        
+        dataset = DatasetStats()
+        for record in train + val + test:
+            dataset.add(record)
+        stats["dataset"] = dataset.to_dict()
+        # Committed sizes, from which an append extends the split files
+        stats["split_file_bytes"] = {
+            split: (output_path / f"{split}.json").stat().st_size for split in SPLITS
+        }
+        _add_throughput(stats, timings, time.perf_counter() - start, self.num_workers)
+        
+        _write_stats(output_path / "stats.json", stats)
+        
+        print(f"Saved to {output_path}")
+        print("Done!")
+        
+        return stats
+    
+    def config_fingerprint(self) -> str:
+        """Hash of the config and keyword tables, checked before an append."""
+        state = {
+            "config": asdict(self.config),
+            "household_filter": self.household_filter.fingerprint(),
+        }
+        encoded = json.dumps(state, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()[:16]
+    
+    def _stage_keys(self, raw_texts: List[str]) -> Dict[str, str]:
+        """Cache key per stage, each chained from the previous stage's key."""
+        digest = hashlib.sha256()
+        for text in raw_texts:
+            digest.update(text.encode('utf-8') if isinstance(text, str) else repr(text).encode())
+            digest.update(b'\0')
+        
+        config = asdict(self.config)
+        keys = {}
+        parent = digest.hexdigest()
+        for stage in CACHED_STAGES:
+            fields = {name: config[name] for name in STAGE_FIELDS[stage]}
+            if stage == "filter":
+                # Keyword and pattern tables live in code, not the config
+                fields["household_filter"] = self.household_filter.fingerprint()
+            if stage == "split" and self.config.split_method == "hash":
+                # Hash assignment never reads the label
+                del fields["stratify_by"]
+            parent = StageCache.key(parent, stage, fields)
+            keys[stage] = parent
+        return keys
+    
+    def _save_stage(self, stage: str, keys: Dict[str, str], stats: Dict, data: Dict) -> None:
+        """Store a completed stage with the stage statistics gathered so far."""
+        if self.cache:
+            stage_stats = {k: v for k, v in stats.items() if k not in _RUN_STATS}
+            self.cache.save(stage, keys[stage], {**data, "stats": stage_stats})
+    
+    def run_stream(
+        self,
+        raw_texts: Iterable[str],
+        output_dir: str,
+        shard_size: int = 100_000,
+    ) -> Dict:
+        """
+        Run the pipeline over a stream of texts with flat memory.
+        
+        Records flow through cleaning, filtering and household generation
+        as generators. Each is assigned a split on arrival and appended to
+        that split's JSONL shards ({split}-NNNNN.jsonl, ``shard_size``
+        records each). Component sidecars are sharded the same way.
+        
+        Args:
+            raw_texts: Iterable of raw text records (e.g. iter_input_texts)
+            output_dir: Directory to save processed data
+            shard_size: Records per output shard
+            
+        Returns:
+            Summary statistics
+        """
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        
+        stats = {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "config_fingerprint": self.config_fingerprint(),
+        }
+        start = time.perf_counter()
+        timings = _stage_timings()
+        deduplicator = Deduplicator(self.config)
+        excluded: Dict[str, int] = {}
+        
+        print("Starting streaming preprocessing pipeline...")
+        if self.scanner.unsupported:
+            print(f"  Exclusion types not applied: {', '.join(self.scanner.unsupported)}")
+        
+        scanned = self._scan(raw_texts, timings, deduplicator)
+        component_writer = ComponentWriter(output_path, self.household_filter, shard_size)
+        filtered = self._filter(scanned, excluded, component_writer)
+        
+        writers = {split: ShardWriter(output_path, split, shard_size) for split in SPLITS}
+        dataset = DatasetStats()
+        graphs = HouseholdGraphStore()
+        try:
+            for record in self._generate(filtered, timings):
+                split = self.splitter.assign(record)
+                writers[split].write(record)
+                graphs.add_records(split, (record,))
+                dataset.add(record)
+        finally:
+            for writer in writers.values():
+                writer.close()
+            component_writer.close()
+        if deduplicator.enabled:
+            deduplicator.save(output_path / DEDUP_STATE_FILE)
+            stats["dedup_state_file"] = DEDUP_STATE_FILE
+        graphs.save(output_path / GRAPHS_FILE)
+        stats["graphs_file"] = GRAPHS_FILE
+        
+        kept = sum(writer.count for writer in writers.values())
+        n_input, n_cleaned = timings["clean_records"], timings["dedup_records"]
+        n_unique = timings["filter_records"]
+        stats["input_records"] = n_input
+        stats["after_cleaning"] = n_cleaned
+        stats["dedup"] = deduplicator.summary()
+        stats["after_dedup"] = n_unique
+        stats["excluded"] = excluded
+        stats["after_filtering"] = kept
+        stats["retention_rate"] = kept / n_unique if n_unique else 0
+        for split, writer in writers.items():
+            stats[f"{split}_records"] = writer.count
+        stats["shards"] = {split: writer.shards for split, writer in writers.items()}
+        stats["component_files"] = component_writer.files
+        stats["household_graphs"] = len(graphs)
+        stats["dataset"] = dataset.to_dict()
+        _add_throughput(stats, timings, time.perf_counter() - start, self.num_workers)
+        
+        print(f"  Input: {n_input}, after cleaning: {n_cleaned}, after dedup: {n_unique}")
+        print(f"  Excluded: {sum(excluded.values())} {excluded}")
+        print(f"  After filtering: {kept} ({stats['retention_rate']:.1%} retention)")
+        print(f"  Train: {writers['train'].count}, Val: {writers['val'].count}, "
+              f"Test: {writers['test'].count}")
+        
+        _write_stats(output_path / "stats.json", stats)
         
         print(f"Saved to {output_path}")
         print("Done!")
         
         return stats
     
-    def _simulate_household_score(self, text: str) -> float:
-        """Simulate household relevance score for demo."""
-        text_lower = text.lower()
+    def append(
+        self,
+        raw_texts: Iterable[str],
+        output_dir: str,
+        shard_size: int = 100_000,
+    ) -> Dict:
+        """
+        Process new raw records and append them to existing outputs.
+        
+        Only ``raw_texts`` is read. New records are numbered after the
+        existing input, so record ids stay unique, and are deduplicated
+        against everything already kept via the saved dedup state. Each
+        gets its split from the seeded household hash of
+        ``DataSplitter.assign_household``, so no earlier record moves and,
+        with ``split_method: "hash"``, appended data splits exactly as a
+        full rerun would. Outputs of ``run`` have their {split}.json files
+        extended in place, without reading the old records; outputs of
+        ``run_stream`` gain new JSONL shards. Either way the components of
+        the new records go to a new component file, listed in stats.json
+        with the existing ones. New household structures join the graph store
+        without changing existing graph ids. Counts and dataset statistics
+        in stats.json are merged into the stored totals.
         
-        # Simple keyword scoring
-        household_keywords = [
-            "we", "our", "us", "partner", "spouse", "husband", "wife",
-            "family", "household", "kids", "children", "together"
-        ]
+        Args:
+            raw_texts: Iterable of new raw text records
+            output_dir: Directory holding a previous run's outputs
+            shard_size: Records per new shard, for streamed outputs
+            
+        Returns:
+            Updated summary statistics
+            
+        Raises:
+            FileNotFoundError: If ``output_dir`` has no stats.json
+            ValueError: If the outputs were written with a different config
+        """
+        output_path = Path(output_dir)
+        stats_path = output_path / "stats.json"
+        if not stats_path.exists():
+            raise FileNotFoundError(f"No stats.json in {output_path}; run without --append first")
+        with open(stats_path) as f:
+            stats = json.load(f)
+        committed = dict(stats)
+        if stats.get("config_fingerprint") != self.config_fingerprint():
+            raise ValueError(
+                f"Outputs in {output_path} were written with a different config; "
+                "rerun without --append"
+            )
+        
+        offset = stats["input_records"]
+        streamed = "shards" in stats
+        component_files = stats.setdefault("component_files", [COMPONENTS_FILE])
+        start = time.perf_counter()
+        timings = _stage_timings()
+        excluded: Dict[str, int] = {}
+        deduplicator = Deduplicator(self.config)
+        if deduplicator.enabled:
+            deduplicator.load(output_path / stats.get("dedup_state_file", DEDUP_STATE_FILE))
+        # State files of this append; the committed ones stay untouched
+        generation = len(stats.get("appends", [])) + 1
+        # Households for this batch depend only on the seed and where the
+        # batch starts, not on how many appends came before (batch mode
+        # continues its household stream instead)
+        random.seed(f"{self.config.seed}:{offset}")
+        
+        print(f"Appending to {output_path} from record {offset}...")
+        
+        scanned = self._scan(raw_texts, timings, deduplicator, start=offset)
+        component_writer = ComponentWriter(
+            output_path, self.household_filter, shard_size, first_file=len(component_files),
+        )
+        if streamed:
+            writers = {
+                split: ShardWriter(output_path, split, shard_size, len(stats["shards"][split]))
+                for split in SPLITS
+            }
+        else:
+            new_records: Dict[str, List[Dict]] = {split: [] for split in SPLITS}
+        filtered = self._filter(scanned, excluded, component_writer)
+        
+        counts = dict.fromkeys(SPLITS, 0)
+        dataset = DatasetStats()
+        graphs = HouseholdGraphStore.load(output_path / stats.get("graphs_file", GRAPHS_FILE))
+        try:
+            for record in self._generate(filtered, timings, stats["after_filtering"]):
+                split = self.splitter.assign_household(record)
+                counts[split] += 1
+                graphs.add_records(split, (record,))
+                dataset.add(record)
+                if streamed:
+                    writers[split].write(record)
+                else:
+                    new_records[split].append(record)
+        finally:
+            if streamed:
+                for writer in writers.values():
+                    writer.close()
+            component_writer.close()
         
-        word_count = len(text_lower.split())
-        keyword_count = sum(1 for kw in household_keywords if kw in text_lower)
+        component_files.extend(component_writer.files)
+        if streamed:
+            for split, writer in writers.items():
+                stats["shards"][split].extend(writer.shards)
+        else:
+            sizes = stats.setdefault("split_file_bytes", {})
+            for split in SPLITS:
+                sizes[split] = _extend_json_records(
+                    output_path / f"{split}.json", new_records[split], sizes.get(split),
+                )
+        if deduplicator.enabled:
+            stats["dedup_state_file"] = _generation_file(DEDUP_STATE_FILE, generation)
+            deduplicator.save(output_path / stats["dedup_state_file"])
+        stats["graphs_file"] = _generation_file(GRAPHS_FILE, generation)
+        graphs.save(output_path / stats["graphs_file"])
+        
+        kept = sum(counts.values())
+        n_input, n_cleaned = timings["clean_records"], timings["dedup_records"]
+        n_unique = timings["filter_records"]
+        stats["input_records"] += n_input
+        stats["after_cleaning"] += n_cleaned
+        stats["dedup"] = deduplicator.summary() if deduplicator.enabled else stats["dedup"]
+        stats["after_dedup"] += n_unique
+        for reason, count in excluded.items():
+            stats["excluded"][reason] = stats["excluded"].get(reason, 0) + count
+        stats["after_filtering"] += kept
+        stats["retention_rate"] = (
+            stats["after_filtering"] / stats["after_dedup"] if stats["after_dedup"] else 0
+        )
+        for split in SPLITS:
+            stats[f"{split}_records"] += counts[split]
+        stats["household_graphs"] = len(graphs)
+        merged = DatasetStats.from_dict(stats["dataset"])
+        merged.merge(dataset)
+        stats["dataset"] = merged.to_dict()
+        stats["last_updated"] = datetime.utcnow().isoformat() + "Z"
+        stats.setdefault("appends", []).append({
+            "timestamp": stats["last_updated"],
+            "first_record": offset,
+            "input_records": n_input,
+            "after_dedup": n_unique,
+            "after_filtering": kept,
+            **{f"{split}_records": counts[split] for split in SPLITS},
+        })
+        _add_throughput(stats, timings, time.perf_counter() - start, self.num_workers)
+        
+        print(f"  Input: {n_input}, after cleaning: {n_cleaned}, after dedup: {n_unique}")
+        print(f"  Excluded: {sum(excluded.values())} {excluded}")
+        print(f"  Appended: {kept} (Train: {counts['train']}, Val: {counts['val']}, "
+              f"Test: {counts['test']})")
+        print(f"  Dataset now: {stats['after_filtering']} records")
+        
+        # stats.json last: until it is replaced, the committed state files,
+        # split sizes and shard lists stand, and a retry starts from them
+        _write_stats(stats_path, stats)
+        _remove_superseded(output_path, committed, stats)
+        
+        print("Done!")
+        
+        return stats
+    
+    def _scan(
+        self,
+        raw_texts: Iterable[str],
+        timings: Dict[str, float],
+        deduplicator: Deduplicator,
+        start: int = 0,
+    ) -> Iterator[Tuple[int, str, ScanResult]]:
+        """
+        Clean, deduplicate and scan records chunk by chunk, in input order.
         
-        score = min(keyword_count / 5, 1.0) * 0.6 + random.random() * 0.4
-        return score
+        Cleaning, fingerprinting and scanning run on the pool; duplicate
+        checks run here, in input order, so the same records are kept for
+        any worker count. Yields (index, cleaned_text, scan) for every
+        unique record that survives cleaning, indices counting from
+        ``start``, and adds each chunk's stage timings into ``timings``.
+        """
+        chunks = _enumerated_chunks(raw_texts, self.chunk_size, start)
+        if self.num_workers <= 1:
+            fingerprinter = deduplicator if deduplicator.enabled else None
+            cleaned = (
+                _clean_chunk(self.cleaner, fingerprinter, offset, texts)
+                for offset, texts in chunks
+            )
+            unique = self._deduplicate(_timed(cleaned, timings), deduplicator, timings)
+            yield from self._scan_chunks(unique, timings)
+            return
+        
+        with self._pool() as pool:
+            cleaned = _map_ordered(pool, _clean_worker_chunk, chunks, 2 * self.num_workers)
+            unique = self._deduplicate(_timed(cleaned, timings), deduplicator, timings)
+            yield from self._scan_chunks(unique, timings, pool)
+    
+    def _scan_unique(
+        self,
+        unique: List[Tuple[int, str]],
+        timings: Dict[str, float],
+    ) -> Iterator[Tuple[int, str, ScanResult]]:
+        """Scan already cleaned and deduplicated (index, text) records."""
+        chunks = (
+            unique[start:start + self.chunk_size]
+            for start in range(0, len(unique), self.chunk_size)
+        )
+        if self.num_workers <= 1:
+            yield from self._scan_chunks(chunks, timings)
+            return
+        with self._pool() as pool:
+            yield from self._scan_chunks(chunks, timings, pool)
+    
+    def _scan_chunks(
+        self,
+        chunks: Iterable[List[Tuple[int, str]]],
+        timings: Dict[str, float],
+        pool: Optional[Pool] = None,
+    ) -> Iterator[Tuple[int, str, ScanResult]]:
+        if pool is None:
+            scanned = (_scan_records(self.scanner, records) for records in chunks)
+        else:
+            scanned = _map_ordered(
+                pool, _scan_worker_chunk, ((records,) for records in chunks),
+                2 * self.num_workers,
+            )
+        for records in _timed(scanned, timings):
+            yield from records
+    
+    def _pool(self) -> Pool:
+        return Pool(self.num_workers, initializer=_init_scan_worker, initargs=(self.config,))
+    
+    def _deduplicate(
+        self,
+        cleaned: Iterable[List[Tuple[int, str, Optional[Tuple[int, List[int]]]]]],
+        deduplicator: Deduplicator,
+        timings: Dict[str, float],
+    ) -> Iterator[List[Tuple[int, str]]]:
+        """Drop duplicate records from each cleaned chunk, in input order."""
+        for records in cleaned:
+            start = time.perf_counter()
+            if deduplicator.enabled:
+                unique = [
+                    (idx, text) for idx, text, fingerprint in records
+                    if not deduplicator.is_duplicate(idx, fingerprint)
+                ]
+            else:
+                unique = [(idx, text) for idx, text, _ in records]
+            timings["dedup_seconds"] += time.perf_counter() - start
+            if unique:
+                yield unique
+    
+    def _filter(
+        self,
+        scanned: Iterable[Tuple[int, str, ScanResult]],
+        excluded: Dict[str, int],
+        component_writer: ComponentWriter,
+    ) -> Iterator[Tuple[int, str, float]]:
+        """
+        Apply exclusions and the household filter to scanned records.
+        
+        Counts exclusions into ``excluded``, records the components of
+        every scored record, and yields (index, text, score) for records
+        that pass.
+        """
+        for idx, text, scan in scanned:
+            if scan.exclusion_reason:
+                excluded[scan.exclusion_reason] = excluded.get(scan.exclusion_reason, 0) + 1
+                continue
+            component_writer.add(idx, scan.household)
+            if scan.household.is_household_relevant:
+                yield idx, text, scan.household.relevance_score
+    
+    def _generate(
+        self,
+        filtered: Iterable[Tuple[int, str, float]],
+        timings: Dict[str, float],
+        first_household: int = 0,
+    ) -> Iterator[Dict]:
+        """
+        Attach a synthetic household to each filtered record.
+        
+        In batch mode households are sampled ``chunk_size`` at a time,
+        numbered from ``first_household``, so appended data continues the
+        same household stream a full run would draw.
+        """
+        if self.config.generation_method == "batch":
+            filtered = iter(filtered)
+            household_number = first_household
+            while True:
+                chunk = list(islice(filtered, self.chunk_size))
+                if not chunk:
+                    return
+                start = time.perf_counter()
+                households = self.household_gen.generate_batch(household_number, len(chunk))
+                timings["generate_seconds"] += time.perf_counter() - start
+                timings["generate_records"] += len(chunk)
+                household_number += len(chunk)
+                for (idx, text, score), household in zip(chunk, households):
+                    yield _make_record(idx, text, score, household)
+        
+        for idx, text, score in filtered:
+            start = time.perf_counter()
+            household = self.household_gen.generate()
+            timings["generate_seconds"] += time.perf_counter() - start
+            timings["generate_records"] += 1
+            yield _make_record(idx, text, score, household)
+
+
+def _make_record(idx: int, text: str, score: float, household: Dict) -> Dict:
+    return {
+        "record_id": f"ENS_{idx:05d}",
+        "text": text,
+        "household_relevance_score": round(score, 3),
+        "household": household,
+    }
+
+
+def _write_stats(path: Path, stats: Dict) -> None:
+    """Replace stats.json atomically; it is the commit point of an output directory."""
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(stats, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _generation_file(name: str, generation: int) -> str:
+    """State file name for an append generation (household_graphs-00002.npz)."""
+    return name.replace(".npz", f"-{generation:05d}.npz")
+
+
+def _remove_superseded(output_path: Path, committed: Dict, stats: Dict) -> None:
+    """
+    Delete state files the new stats.json no longer names.
+    
+    Also drops output and component files left behind by an interrupted
+    append that the retry did not overwrite.
+    """
+    live = {stats.get("dedup_state_file"), stats.get("graphs_file")}
+    for key in ("dedup_state_file", "graphs_file"):
+        if committed.get(key) and committed[key] not in live:
+            (output_path / committed[key]).unlink(missing_ok=True)
+    listed = set(stats.get("component_files", []))
+    listed.update(shard for shards in stats.get("shards", {}).values() for shard in shards)
+    patterns = [COMPONENTS_FILE.replace(".npz", "-*.npz")]
+    if "shards" in stats:
+        patterns += [f"{split}-*.jsonl" for split in SPLITS]
+    for pattern in patterns:
+        for path in output_path.glob(pattern):
+            if path.name not in listed:
+                path.unlink()
+
+
+# Whole file, and tail of a non-empty one, for {"records": [...]} at indent=2
+_JSON_RECORDS_EMPTY = b'{\n  "records": []\n}'
+_JSON_RECORDS_CLOSE = b"\n  ]\n}"
+
+
+def _extend_json_records(path: Path, records: List[Dict], committed_size: Optional[int]) -> int:
+    """
+    Append ``records`` in place to a {"records": [...]} split file.
+    
+    Records are written over the closing bracket in the layout json.dump
+    uses at indent=2, so the file matches a full run byte for byte and
+    the old records are never read. ``committed_size`` is the file size
+    recorded by the last completed run or append: writing starts from it,
+    so anything a crashed append left behind is overwritten. A file with
+    no records yet is rewritten whole.
+    
+    Returns:
+        The new file size, to record as committed
+        
+    Raises:
+        ValueError: If the file does not end like a split file from ``run``
+    """
+    size = path.stat().st_size if committed_size is None else committed_size
+    if size == len(_JSON_RECORDS_EMPTY):
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({"records": records}, f, indent=2)
+        os.replace(tmp_path, path)
+        return path.stat().st_size
+    
+    close_at = max(size - len(_JSON_RECORDS_CLOSE), 1)
+    with open(path, 'r+b') as f:
+        # Only the closing bracket can have been overwritten since the
+        # last commit; the record before it is intact
+        f.seek(close_at - 1)
+        tail = f.read(1 + len(_JSON_RECORDS_CLOSE))
+        if tail[:1] != b'}' or (committed_size is None and tail[1:] != _JSON_RECORDS_CLOSE):
+            raise ValueError(f"{path} was not written by PreprocessingPipeline.run")
+        f.seek(close_at)
+        for record in records:
+            encoded = json.dumps(record, indent=2).replace("\n", "\n    ")
+            f.write(f",\n    {encoded}".encode('utf-8'))
+        f.write(_JSON_RECORDS_CLOSE)
+        f.truncate()
+        return f.tell()
+
+
+STAGES = ("clean", "dedup", "filter", "generate")
+
+
+def _stage_timings() -> Dict[str, float]:
+    """Zeroed record counts and seconds for each per-record stage."""
+    timings: Dict[str, float] = {}
+    for stage in STAGES:
+        timings[f"{stage}_records"] = 0
+        timings[f"{stage}_seconds"] = 0.0
+    return timings
+
+
+def _add_throughput(
+    stats: Dict,
+    timings: Dict[str, float],
+    wall_seconds: float,
+    num_workers: int,
+) -> None:
+    """
+    Record per-stage and overall throughput in ``stats``.
+    
+    Stage rates are records per second of time spent in that stage,
+    summed over workers (i.e. per core); ``records_per_second`` is input
+    records over wall time for the whole run.
+    """
+    stats["workers"] = num_workers
+    stats["stage_records_per_second"] = {
+        stage: round(timings[f"{stage}_records"] / timings[f"{stage}_seconds"], 1)
+        if timings[f"{stage}_seconds"] else 0.0
+        for stage in STAGES
+    }
+    stats["wall_seconds"] = round(wall_seconds, 3)
+    stats["records_per_second"] = (
+        round(timings["clean_records"] / wall_seconds, 1) if wall_seconds else 0.0
+    )
+
+
+def _enumerated_chunks(
+    texts: Iterable[str],
+    size: int,
+    start: int = 0,
+) -> Iterator[Tuple[int, List[str]]]:
+    """Yield (offset of first text, list of up to ``size`` texts), counting from ``start``."""
+    iterator = iter(texts)
+    offset = start
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield offset, chunk
+        offset += len(chunk)
+
+
+def _clean_chunk(
+    cleaner: TextCleaner,
+    deduplicator: Optional[Deduplicator],
+    offset: int,
+    texts: List[str],
+) -> Tuple[List[Tuple[int, str, Optional[Tuple[int, List[int]]]]], Dict[str, float]]:
+    """Clean one chunk and fingerprint the kept texts, timing each stage."""
+    start = time.perf_counter()
+    cleaned = list(cleaner.clean_stream(texts))
+    cleaned_at = time.perf_counter()
+    if deduplicator is not None:
+        records = [(offset + i, text, deduplicator.fingerprint(text)) for i, text in cleaned]
+    else:
+        records = [(offset + i, text, None) for i, text in cleaned]
+    timings = {
+        "clean_records": len(texts),
+        "clean_seconds": cleaned_at - start,
+        "dedup_records": len(cleaned),
+        "dedup_seconds": time.perf_counter() - cleaned_at,
+    }
+    return records, timings
+
+
+def _scan_records(
+    scanner: RecordScanner,
+    records: List[Tuple[int, str]],
+) -> Tuple[List[Tuple[int, str, ScanResult]], Dict[str, float]]:
+    """Scan one chunk of unique records, timing the filter stage."""
+    start = time.perf_counter()
+    scanned = [(idx, text, scanner.scan(text)) for idx, text in records]
+    timings = {
+        "filter_records": len(records),
+        "filter_seconds": time.perf_counter() - start,
+    }
+    return scanned, timings
+
+
+def _timed(results: Iterable[Tuple[Any, Dict[str, float]]], timings: Dict[str, float]) -> Iterator:
+    """Add each (payload, chunk_timings) pair's timings into ``timings``."""
+    for payload, chunk_timings in results:
+        for key, value in chunk_timings.items():
+            timings[key] += value
+        yield payload
+
+
+def _map_ordered(pool: Pool, func, args: Iterable[tuple], max_pending: int) -> Iterator:
+    """
+    Apply ``func(*a)`` for each ``a`` in ``args`` on ``pool``, yielding
+    results in input order with at most ``max_pending`` tasks in flight.
+    """
+    pending = deque()
+    for task_args in args:
+        pending.append(pool.apply_async(func, task_args))
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+# Per-process cleaner, fingerprinter and scanner, built once by the pool
+# initializer
+_scan_worker: Optional[Tuple[TextCleaner, Optional[Deduplicator], RecordScanner]] = None
+
+
+def _init_scan_worker(config: PreprocessConfig) -> None:
+    global _scan_worker
+    household_filter = HouseholdFilter(config.household_filter_config())
+    deduplicator = Deduplicator(config)
+    _scan_worker = (
+        TextCleaner(config),
+        deduplicator if deduplicator.enabled else None,
+        RecordScanner(config.exclusions, household_filter),
+    )
+
+
+def _clean_worker_chunk(offset: int, texts: List[str]):
+    cleaner, deduplicator, _ = _scan_worker
+    return _clean_chunk(cleaner, deduplicator, offset, texts)
+
+
+def _scan_worker_chunk(records: List[Tuple[int, str]]):
+    _, _, scanner = _scan_worker
+    return _scan_records(scanner, records)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Preprocess data for Envis Insight Engine")
     parser.add_argument("--input", type=str, required=True,
-                        help="Input data file (JSON or CSV)")
+                        help="Input data file (JSON, JSONL or CSV)")
     parser.add_argument("--output", type=str, required=True,
                         help="Output directory for processed data")
-    parser.add_argument("--threshold", type=float, default=0.4,
-                        help="Household relevance threshold")
-    parser.add_argument("--seed", type=int, default=42,
-                        help="Random seed")
+    parser.add_argument("--config", type=str, default=None,
+                        help="Preprocessing config YAML (e.g. config/preprocess_config.yaml)")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Household relevance threshold (overrides config)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Random seed (overrides config)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes for cleaning and scanning (output is identical for any count)")
+    parser.add_argument("--chunk-size", type=int, default=1000,
+                        help="Records per worker task")
+    parser.add_argument("--cache-dir", type=str, default=None,
+                        help="Stage cache directory; reruns resume after unchanged stages "
+                             "(not used with --stream)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream records and write JSONL shards (flat memory)")
+    parser.add_argument("--shard-size", type=int, default=100_000,
+                        help="Records per JSONL shard in --stream mode")
+    parser.add_argument("--append", action="store_true",
+                        help="Process only --input and append it to the existing outputs in --output")
     
     args = parser.parse_args()
     
     # Load config
-    config = PreprocessConfig(
-        household_threshold=args.threshold,
-        seed=args.seed,
-    )
-    
-    # Load input data
-    input_path = Path(args.input)
-    if input_path.suffix == '.json':
-        with open(input_path) as f:
-            data = json.load(f)
-        texts = [r.get("text", "") for r in data.get("records", [])]
-    elif input_path.suffix == '.csv':
-        texts = []
-        with open(input_path) as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                texts.append(row.get("text", ""))
-    else:
-        raise ValueError(f"Unsupported input format: {input_path.suffix}")
+    config = PreprocessConfig.from_yaml(args.config) if args.config else PreprocessConfig()
+    if args.threshold is not None:
+        config.household_threshold = args.threshold
+    if args.seed is not None:
+        config.seed = args.seed
     
     # Run pipeline
-    pipeline = PreprocessingPipeline(config)
-    stats = pipeline.run(texts, args.output)
+    pipeline = PreprocessingPipeline(
+        config, num_workers=args.workers, chunk_size=args.chunk_size, cache_dir=args.cache_dir,
+    )
+    if args.append:
+        stats = pipeline.append(iter_input_texts(args.input), args.output, args.shard_size)
+    elif args.stream:
+        stats = pipeline.run_stream(iter_input_texts(args.input), args.output, args.shard_size)
+    else:
+        stats = pipeline.run(list(iter_input_texts(args.input)), args.output)
     
     print("\nSummary:")
     print(json.dumps(stats, indent=2))
@@ -0,0 +1,70 @@
+"""
+Envis Insight Engine - Offline Pre-tokenisation
+
+Tokenises the cleaned text of every processed record once with the text
+encoder's tokenizer and writes a memory-mapped token store per split
+(see src/token_store.py). Training and evaluation then read token ids with
+TokenizedTextDataset instead of running the tokenizer every epoch.
+
+Stores are keyed by tokenizer and max_length. After preprocess.py --append,
+rerunning this script tokenises only the new records; a different
+tokenizer or max_length rebuilds the split.
+
+Usage:
+    python pretokenize.py --data data/processed/
+    python pretokenize.py --data data/processed/ --output data/processed/tokens/ \\
+        --tokenizer ProsusAI/finbert --max-length 512
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from token_store import load_tokenizer, write_token_store  # noqa: E402
+from preprocess import SPLITS, iter_split_records  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-tokenise processed records")
+    parser.add_argument("--data", type=str, required=True,
+                        help="Output directory of preprocess.py")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Token store directory (default: <data>/tokens)")
+    parser.add_argument("--tokenizer", type=str, default="ProsusAI/finbert",
+                        help="HuggingFace tokenizer name (ModelConfig.text_model_name)")
+    parser.add_argument("--max-length", type=int, default=512,
+                        help="Truncation length in tokens, including special tokens")
+    parser.add_argument("--batch-size", type=int, default=1000,
+                        help="Texts per tokenizer call")
+
+    args = parser.parse_args()
+
+    output_dir = Path(args.output) if args.output else Path(args.data) / "tokens"
+    tokenizer = load_tokenizer(args.tokenizer)
+
+    summary = {}
+    for split in SPLITS:
+        start = time.perf_counter()
+        record_ids, texts = [], []
+        for record in iter_split_records(args.data, split):
+            record_ids.append(record["record_id"])
+            texts.append(record["text"])
+        meta = write_token_store(
+            output_dir, split, record_ids, texts, tokenizer,
+            args.tokenizer, args.max_length, args.batch_size,
+        )
+        elapsed = time.perf_counter() - start
+        print(f"{split}: {meta['tokenised']} of {meta['records']} records tokenised "
+              f"in {elapsed:.1f}s ({meta['tokens']} tokens)")
+        summary[split] = {k: meta[k] for k in ("records", "tokenised", "tokens", "key")}
+
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
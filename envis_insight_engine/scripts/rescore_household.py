@@ -0,0 +1,124 @@
+"""
+Envis Insight Engine - Household Re-scoring
+
+Re-derives the household keep set from the component sidecar written by
+preprocess.py (household_components.npz, or the
+household_components-NNNNN.npz files of --stream mode and --append,
+listed under component_files in stats.json) under a new
+threshold or new signal weights. No text is rescanned: the four stored
+component columns are recombined with HouseholdFilter.scores_from_components,
+so a full dataset re-scores in well under a second.
+
+Weights and threshold are the only settings that can change this way.
+Keyword lists, goal patterns and word-boundary matching alter the
+components themselves and need a fresh preprocess.py run.
+
+Usage:
+    python rescore_household.py --sidecar data/processed/household_components.npz --threshold 0.5
+    python rescore_household.py --sidecar data/processed/household_components.npz \\
+        --config config/preprocess_config.yaml --output data/processed/rescored.json
+    python rescore_household.py --sidecar data/processed/household_components.npz \\
+        --weights 0.4 0.2 0.3 0.1
+    python rescore_household.py --sidecar data/processed/household_components-*.npz --threshold 0.5
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, replace
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from household_filter import (  # noqa: E402
+    SIGNAL_NAMES,
+    HouseholdFilter,
+    HouseholdFilterConfig,
+    load_components,
+)
+from preprocess import PreprocessConfig  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score household relevance from stored components")
+    parser.add_argument("--sidecar", type=str, nargs="+", required=True,
+                        help="household_components*.npz file(s) written by preprocess.py")
+    parser.add_argument("--config", type=str, default=None,
+                        help="Preprocessing config YAML to take threshold and weights from")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Household relevance threshold (overrides config)")
+    parser.add_argument("--weights", type=float, nargs=4, default=None,
+                        metavar=tuple(w.upper() for w in SIGNAL_NAMES),
+                        help="Signal weights (overrides config)")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Optional JSON file for the kept record ids and summary")
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    loaded = [load_components(path) for path in args.sidecar]
+    record_index = np.concatenate([index for index, _, _ in loaded])
+    components = np.concatenate([block for _, block, _ in loaded])
+    metadata = loaded[0][2]
+    if any(meta != metadata for _, _, meta in loaded[1:]):
+        raise ValueError("Sidecar files were written with different filter configs")
+    stored_config = HouseholdFilterConfig(**metadata["config"])
+
+    # Start from the config the sidecar was written with, so only the
+    # settings given here change
+    if args.config:
+        config = replace(
+            PreprocessConfig.from_yaml(args.config).household_filter_config(),
+            keyword_word_boundaries=stored_config.keyword_word_boundaries,
+        )
+    else:
+        config = stored_config
+    if args.threshold is not None:
+        config = replace(config, relevance_threshold=args.threshold)
+    if args.weights is not None:
+        config = replace(
+            config,
+            keyword_weight=args.weights[0],
+            pronoun_weight=args.weights[1],
+            shared_goal_weight=args.weights[2],
+            multi_person_weight=args.weights[3],
+        )
+
+    household_filter = HouseholdFilter(config)
+    if household_filter.signal_fingerprint() != metadata["signal_fingerprint"]:
+        print("Warning: keywords or patterns changed since the sidecar was written; "
+              "re-run preprocess.py for exact components")
+
+    keep = household_filter.scores_from_components(components).is_household_relevant
+    stored_keep = HouseholdFilter(stored_config).scores_from_components(components).is_household_relevant
+    elapsed = time.perf_counter() - start
+
+    summary = {
+        "config": asdict(config),
+        "scored_records": len(record_index),
+        "kept": int(keep.sum()),
+        "retention_rate": float(keep.mean()) if len(keep) else 0.0,
+        "added": int((keep & ~stored_keep).sum()),
+        "removed": int((stored_keep & ~keep).sum()),
+        "seconds": round(elapsed, 4),
+    }
+
+    print(f"Re-scored {summary['scored_records']} records in {elapsed:.3f}s")
+    print(f"  Kept: {summary['kept']} ({summary['retention_rate']:.1%} retention)")
+    print(f"  Versus stored config: +{summary['added']} / -{summary['removed']}")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        kept_ids = [f"ENS_{idx:05d}" for idx in record_index[np.flatnonzero(keep)]]
+        with open(output_path, "w") as f:
+            json.dump({"summary": summary, "record_ids": kept_ids}, f, indent=2)
+        print(f"Saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Envis Insight Engine - Household Filter Threshold and Weight Sweep
+
+Reproduces the precision/recall table for the household relevance filter
+(Appendix S, Part 2.1) and explores alternative HouseholdFilterConfig
+weights without re-scoring any text.
+
+The four component signals are computed once per record into an (n, 4)
+matrix. Every weight combination on a simplex grid is then evaluated at
+every threshold with vectorised NumPy: scores are bucketed against the
+sorted thresholds, positive/negative counts per bucket are accumulated
+with bincount, and a reverse cumulative sum gives the confusion counts
+at all thresholds at once.
+
+Usage:
+    python sweep_household_filter.py --data data/labelled.json --label-field labels.household_relevant
+    python sweep_household_filter.py --data data/samples/labelled_samples_extended.json \\
+        --label-field household_relevance_score --label-threshold 0.4 --output results/sweep.csv
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from itertools import product
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from household_filter import HouseholdFilter, HouseholdFilterConfig, SIGNAL_NAMES  # noqa: E402
+
+
+def load_labelled_records(
+    path: str,
+    label_field: str,
+    label_threshold: Optional[float] = None,
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Load texts and binary household labels from JSON or JSONL.
+
+    ``label_field`` may be dotted (e.g. ``labels.household_relevant``).
+    Numeric labels are binarised with ``label_threshold`` when given.
+    Records without the label are skipped.
+    """
+    path = Path(path)
+    if path.suffix == ".jsonl":
+        with open(path) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+    else:
+        with open(path) as f:
+            data = json.load(f)
+        records = data.get("records") or data.get("samples") or []
+
+    texts, labels = [], []
+    for record in records:
+        value = record
+        for key in label_field.split("."):
+            value = value.get(key) if isinstance(value, dict) else None
+        if value is None:
+            continue
+        if label_threshold is not None:
+            value = float(value) >= label_threshold
+        texts.append(record.get("text", ""))
+        labels.append(bool(value))
+
+    return texts, np.array(labels, dtype=bool)
+
+
+def weight_grid(step: float) -> np.ndarray:
+    """All (keyword, pronoun, shared_goal, multi_person) weights on a simplex grid."""
+    n = int(round(1.0 / step))
+    combos = [
+        (a, b, c, n - a - b - c)
+        for a, b, c in product(range(n + 1), repeat=3)
+        if a + b + c <= n
+    ]
+    return np.array(combos, dtype=np.float64) / n
+
+
+def sweep(
+    components: np.ndarray,
+    labels: np.ndarray,
+    weights: np.ndarray,
+    thresholds: np.ndarray,
+    block_size: int = 256,
+) -> Dict[str, np.ndarray]:
+    """
+    Precision, recall and F1 for every weight row at every threshold.
+
+    Args:
+        components: (n, 4) component signals, columns in SIGNAL_NAMES order
+        labels: (n,) boolean ground truth
+        weights: (m, 4) weight combinations
+        thresholds: (t,) ascending thresholds
+        block_size: Weight rows scored at once (bounds memory at n * block_size)
+
+    Returns:
+        Dict of (m, t) arrays: precision, recall, f1, true_positives, predicted
+    """
+    n_thresholds = len(thresholds)
+    n_positive = int(labels.sum())
+    true_positives = np.empty((len(weights), n_thresholds), dtype=np.int64)
+    predicted = np.empty((len(weights), n_thresholds), dtype=np.int64)
+
+    for start in range(0, len(weights), block_size):
+        block = weights[start:start + block_size]
+        m = len(block)
+        # Same operation order as HouseholdFilter._relevance, so decisions at
+        # the configured weights match the filter exactly
+        scores = (
+            components[:, 0:1] * block[:, 0] +
+            components[:, 1:2] * block[:, 1] +
+            components[:, 2:3] * block[:, 2] +
+            components[:, 3:4] * block[:, 3]
+        )
+        # bucket k means score >= thresholds[i] exactly for i < k
+        buckets = np.searchsorted(thresholds, scores, side="right")
+        flat = buckets + (n_thresholds + 1) * np.arange(m)
+        size = m * (n_thresholds + 1)
+        all_counts = np.bincount(flat.ravel(), minlength=size).reshape(m, -1)
+        pos_counts = np.bincount(flat[labels].ravel(), minlength=size).reshape(m, -1)
+        # Records kept at threshold i: sum of counts in buckets i+1..t
+        predicted[start:start + m] = np.cumsum(all_counts[:, ::-1], axis=1)[:, ::-1][:, 1:]
+        true_positives[start:start + m] = np.cumsum(pos_counts[:, ::-1], axis=1)[:, ::-1][:, 1:]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, true_positives / predicted, 0.0)
+        recall = true_positives / n_positive if n_positive else np.zeros_like(precision)
+        f1 = np.where(
+            precision + recall > 0,
+            2 * precision * recall / (precision + recall),
+            0.0,
+        )
+
+    return {
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "true_positives": true_positives,
+        "predicted": predicted,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep household filter thresholds and weights")
+    parser.add_argument("--data", type=str, required=True,
+                        help="Labelled records (JSON with records/samples, or JSONL)")
+    parser.add_argument("--label-field", type=str, default="labels.household_relevant",
+                        help="Dotted path to the household label in each record")
+    parser.add_argument("--label-threshold", type=float, default=None,
+                        help="Binarise a numeric label field at this value")
+    parser.add_argument("--weight-step", type=float, default=0.05,
+                        help="Grid step for signal weights (weights sum to 1.0)")
+    parser.add_argument("--threshold-step", type=float, default=0.01,
+                        help="Grid step for relevance thresholds in [0, 1]")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Number of best configurations to print")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Optional CSV of every (weights, threshold) result")
+
+    args = parser.parse_args()
+
+    texts, labels = load_labelled_records(args.data, args.label_field, args.label_threshold)
+    if not texts:
+        raise ValueError(f"No records with label field '{args.label_field}' in {args.data}")
+    print(f"Loaded {len(texts)} labelled records ({int(labels.sum())} positive)")
+
+    start = time.perf_counter()
+    components = HouseholdFilter().component_matrix(texts)
+    print(f"Computed component signals in {time.perf_counter() - start:.2f}s")
+
+    default = HouseholdFilterConfig()
+    default_weights = np.array([
+        default.keyword_weight, default.pronoun_weight,
+        default.shared_goal_weight, default.multi_person_weight,
+    ])
+    n_steps = int(round(1.0 / args.threshold_step))
+    thresholds = np.round(np.linspace(0.0, 1.0, n_steps + 1), 6)
+    weights = np.vstack([default_weights, weight_grid(args.weight_step)])
+
+    start = time.perf_counter()
+    results = sweep(components, labels, weights, thresholds)
+    elapsed = time.perf_counter() - start
+    print(f"Evaluated {len(weights)} weight combinations x {len(thresholds)} thresholds "
+          f"in {elapsed:.2f}s")
+
+    # Configured weights at the documented thresholds
+    print("\nConfigured weights:")
+    for threshold in (0.3, 0.4, 0.5):
+        i = int(np.argmin(np.abs(thresholds - threshold)))
+        print(f"  Threshold {thresholds[i]:.2f}: "
+              f"Precision {results['precision'][0, i]:.2f}, "
+              f"Recall {results['recall'][0, i]:.2f}, "
+              f"F1 {results['f1'][0, i]:.2f}")
+
+    print(f"\nTop {args.top} by F1:")
+    order = np.argsort(results["f1"], axis=None)[::-1][:args.top]
+    for flat_index in order:
+        w, i = np.unravel_index(flat_index, results["f1"].shape)
+        weight_str = ", ".join(f"{name}={weights[w, j]:.2f}" for j, name in enumerate(SIGNAL_NAMES))
+        print(f"  {weight_str}, threshold={thresholds[i]:.2f}: "
+              f"P={results['precision'][w, i]:.3f} R={results['recall'][w, i]:.3f} "
+              f"F1={results['f1'][w, i]:.3f}")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([f"{name}_weight" for name in SIGNAL_NAMES] +
+                            ["threshold", "precision", "recall", "f1"])
+            for w in range(len(weights)):
+                for i in range(len(thresholds)):
+                    writer.writerow(
+                        [f"{x:.4f}" for x in weights[w]] +
+                        [f"{thresholds[i]:.4f}",
+                         f"{results['precision'][w, i]:.4f}",
+                         f"{results['recall'][w, i]:.4f}",
+                         f"{results['f1'][w, i]:.4f}"]
+                    )
+        print(f"\nSaved sweep to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,9 +17,24 @@ At threshold 0.4:
 - 81% of all household-relevant records are captured (recall)
 """
 
+import hashlib
+import json
 import re
-from dataclasses import dataclass
-from typing import List, Tuple, Optional
+import sqlite3
+import time
+from bisect import bisect_right
+from collections import Counter, OrderedDict, deque
+from dataclasses import asdict, dataclass
+from itertools import chain, islice
+from multiprocessing import Pool
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Optional, Union
+
+import numpy as np
+
+try:
+    from re import _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
 
 
 @dataclass
@@ -35,6 +50,11 @@ class HouseholdFilterConfig:
     # Threshold for classification
     relevance_threshold: float = 0.40
     
+    # Only count keywords bounded by non-word characters ("wife" will not
+    # match inside "housewife"). Off by default to keep the validated
+    # substring semantics behind the published precision/recall figures.
+    keyword_word_boundaries: bool = False
+    
     def __post_init__(self):
         total = (self.keyword_weight + self.pronoun_weight + 
                  self.shared_goal_weight + self.multi_person_weight)
@@ -90,6 +110,440 @@ SHARED_GOAL_PATTERNS = [
 PLURAL_FIRST_PERSON = {'we', 'us', 'our', 'ours', 'ourselves'}
 ALL_FIRST_PERSON = {'i', 'me', 'my', 'mine', 'myself', 'we', 'us', 'our', 'ours', 'ourselves'}
 
+# Person reference patterns as (first word, second word) alternatives,
+# matched as "<first> <second>" on word boundaries
+PERSON_REFERENCE_PATTERNS = [
+    (('my', 'our'),
+     ('partner', 'spouse', 'husband', 'wife', 'son', 'daughter', 'kid',
+      'child', 'mom', 'dad', 'mother', 'father')),
+    (('he', 'she', 'they'),
+     ('said', 'thinks', 'wants', 'needs', 'spent', 'bought')),
+]
+
+# Component signals in the order they are weighted and reported
+SIGNAL_NAMES = ('keyword', 'pronoun', 'shared_goal', 'multi_person')
+
+# Signal order for HouseholdFilter.decide(), cheapest first: the fused goal
+# regex, then the keyword automaton (which carries the largest weight), then
+# the two token-based signals that need the text tokenised
+_DECISION_ORDER = ('shared_goal', 'keyword', 'pronoun', 'multi_person')
+
+# Slack on early decisions, so partial sums taken in decision order cannot
+# disagree with the full sum over float rounding
+_DECISION_MARGIN = 1e-9
+
+# Bumped whenever the layout of save_artefact() output changes
+FILTER_ARTEFACT_VERSION = 1
+_AUTOMATON_TABLES = ('chars', 'targets', 'offsets', 'outputs', 'output_offsets')
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+# Characters that IGNORECASE matching equates with an ASCII letter but that
+# str.lower() leaves unchanged (or changes length), so the lowered text
+# cannot stand in for case-insensitive matching on the original
+_CASE_FOLD_EXCEPTIONS = ('\u0130', '\u0131', '\u017f')
+
+
+class _TokenizedText:
+    """
+    Per-record view shared by all four signals.
+    
+    Lowercases the text and splits it into word tokens at most once; the
+    keyword and goal signals scan ``lower``, the pronoun and person signals
+    work from ``tokens`` and ``counts``. Tokens are built on first use, so
+    decisions settled by the keyword and goal signals never tokenise.
+    """
+    
+    __slots__ = ('text', 'lower', '_tokens', '_counts')
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.lower = text.lower()
+        self._tokens = None
+        self._counts = None
+    
+    @property
+    def tokens(self) -> List[str]:
+        if self._tokens is None:
+            self._tokens = _WORD_PATTERN.findall(self.lower)
+        return self._tokens
+    
+    @property
+    def counts(self) -> Counter:
+        if self._counts is None:
+            self._counts = Counter(self.tokens)
+        return self._counts
+    
+    @property
+    def case_aligned(self) -> bool:
+        """Whether ``lower`` can replace case-insensitive matching on ``text``."""
+        return not any(ch in self.text for ch in _CASE_FOLD_EXCEPTIONS)
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick multi-keyword matcher.
+    
+    Compiles the keyword table once into a deterministic automaton so that
+    every keyword is found in a single left-to-right pass over the text,
+    independent of vocabulary size. Keywords are matched case-sensitively;
+    callers pass lowercased text, as ``HouseholdFilter`` does.
+    
+    Usage:
+        matcher = KeywordAutomaton(['joint account', 'partner'])
+        matcher.find('my partner and i')  # -> [1]
+    """
+    
+    def __init__(self, keywords: List[str], word_boundaries: bool = False):
+        self.keywords = list(keywords)
+        self.word_boundaries = word_boundaries
+        self._lengths = [len(k) for k in self.keywords]
+        
+        # Trie construction: goto[state] maps char -> next state
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for idx, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(idx)
+        
+        # Breadth-first pass: failure links, merged outputs and a full
+        # transition table so scanning never has to follow failure chains
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            fallback = delta[fail[state]]
+            transitions = {ch: nxt for ch, nxt in fallback.items() if nxt}
+            for ch, nxt in goto[state].items():
+                fail[nxt] = fallback.get(ch, 0) if state else 0
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+                transitions[ch] = nxt
+                queue.append(nxt)
+            delta[state] = transitions
+        
+        self._delta = delta
+        self._outputs = [tuple(o) for o in outputs]
+        self._tables = None
+    
+    def to_tables(self) -> Dict[str, np.ndarray]:
+        """
+        The compiled automaton as flat arrays.
+        
+        State ``s`` owns transitions ``offsets[s]:offsets[s + 1]`` of
+        ``chars`` / ``targets``, and outputs ``output_offsets[s]:output_offsets[s + 1]``
+        of ``outputs``.
+        """
+        if self._tables is not None:
+            return dict(self._tables)
+        delta = self._delta
+        return {
+            'chars': np.array(''.join(''.join(transitions) for transitions in delta)),
+            'targets': np.fromiter(
+                (nxt for transitions in delta for nxt in transitions.values()),
+                dtype=np.int32,
+            ),
+            'offsets': _offsets(len(transitions) for transitions in delta),
+            'outputs': np.fromiter(
+                (idx for output in self._outputs for idx in output), dtype=np.int32,
+            ),
+            'output_offsets': _offsets(len(output) for output in self._outputs),
+        }
+    
+    @classmethod
+    def from_tables(
+        cls,
+        keywords: List[str],
+        tables: Dict[str, np.ndarray],
+        word_boundaries: bool = False,
+    ) -> 'KeywordAutomaton':
+        """
+        Rebuild a matcher from ``to_tables()`` output without recompiling.
+        
+        A state's transition dict is built from the tables the first time
+        a scan reaches it, so loading costs nothing per state and a worker
+        only ever materialises the states its texts visit.
+        """
+        matcher = cls.__new__(cls)
+        matcher.keywords = list(keywords)
+        matcher.word_boundaries = word_boundaries
+        matcher._lengths = [len(k) for k in matcher.keywords]
+        matcher._tables = {name: tables[name] for name in _AUTOMATON_TABLES}
+        matcher._chars = str(tables['chars'])
+        
+        n_states = len(tables['offsets']) - 1
+        matcher._delta = [None] * n_states
+        outputs, output_offsets = tables['outputs'], tables['output_offsets']
+        matcher._outputs = [()] * n_states
+        for state in np.flatnonzero(np.diff(output_offsets)).tolist():
+            start, end = output_offsets[state], output_offsets[state + 1]
+            matcher._outputs[state] = tuple(outputs[start:end].tolist())
+        return matcher
+    
+    def _load_state(self, state: int) -> Dict[str, int]:
+        """Build and keep the transition dict of a state loaded by ``from_tables``."""
+        offsets = self._tables['offsets']
+        start, end = int(offsets[state]), int(offsets[state + 1])
+        transitions = dict(zip(self._chars[start:end], self._tables['targets'][start:end].tolist()))
+        self._delta[state] = transitions
+        return transitions
+    
+    def find(self, text: str) -> List[int]:
+        """
+        Return the sorted indices of all keywords occurring in ``text``.
+        
+        Overlapping and nested occurrences are all reported. With
+        ``word_boundaries`` enabled, a match only counts when it is not
+        flanked by word characters.
+        """
+        delta = self._delta
+        outputs = self._outputs
+        found = set()
+        state = 0
+        
+        if not self.word_boundaries:
+            for ch in text:
+                transitions = delta[state]
+                if transitions is None:
+                    transitions = self._load_state(state)
+                state = transitions.get(ch, 0)
+                if outputs[state]:
+                    found.update(outputs[state])
+            return sorted(found)
+        
+        lengths = self._lengths
+        n = len(text)
+        for end, ch in enumerate(text):
+            transitions = delta[state]
+            if transitions is None:
+                transitions = self._load_state(state)
+            state = transitions.get(ch, 0)
+            if not outputs[state]:
+                continue
+            for idx in outputs[state]:
+                start = end - lengths[idx] + 1
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if end + 1 < n and _is_word_char(text[end + 1]):
+                    continue
+                found.add(idx)
+        return sorted(found)
+
+
+def _offsets(lengths: Iterable[int]) -> np.ndarray:
+    """Start offsets of consecutive runs, plus the total at the end."""
+    return np.concatenate(([0], np.cumsum(np.fromiter(lengths, dtype=np.int64))))
+
+
+def _is_word_char(ch: str) -> bool:
+    """Match the regex ``\\w`` definition of a word character."""
+    return ch.isalnum() or ch == '_'
+
+
+def _first_chars(pattern: str) -> Optional[frozenset]:
+    """
+    The characters a match of ``pattern`` can start with.
+    
+    Read from the parsed pattern: literals, small character classes and
+    alternations of those, looking through groups, required repeats and
+    zero-width assertions. Returns None when the set cannot be bounded
+    that way (e.g. ``\\w``, an optional first item, IGNORECASE), meaning
+    any character may start a match.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern)
+    except re.error:
+        return None
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+    return _leading_chars(parsed)
+
+
+def _leading_chars(items) -> Optional[frozenset]:
+    """First-character set of a parsed sequence, or None if unbounded."""
+    for op, arg in items:
+        if op in (_sre_parse.AT, _sre_parse.ASSERT, _sre_parse.ASSERT_NOT):
+            continue
+        if op is _sre_parse.LITERAL:
+            return frozenset(chr(arg))
+        if op is _sre_parse.IN:
+            chars = set()
+            for item_op, item_arg in arg:
+                if item_op is _sre_parse.LITERAL:
+                    chars.add(chr(item_arg))
+                elif item_op is _sre_parse.RANGE and item_arg[1] - item_arg[0] < 256:
+                    chars.update(map(chr, range(item_arg[0], item_arg[1] + 1)))
+                else:
+                    return None
+            return frozenset(chars)
+        if op is _sre_parse.BRANCH:
+            chars = set()
+            for branch in arg[1]:
+                branch_chars = _leading_chars(branch)
+                if branch_chars is None:
+                    return None
+                chars.update(branch_chars)
+            return frozenset(chars)
+        if op is _sre_parse.SUBPATTERN:
+            _, add_flags, _, body = arg
+            if add_flags & re.IGNORECASE:
+                return None
+            return _leading_chars(body)
+        if op in (_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT) and arg[0] > 0:
+            return _leading_chars(arg[2])
+        return None
+    return None
+
+
+class GoalPatternSet:
+    """
+    Shared-goal patterns fused into a single alternation.
+    
+    Each pattern becomes one branch of a combined regex, tagged with an
+    empty named group at its end, so one scan per record reports every
+    distinct pattern that fires. Adding patterns grows the alternation,
+    not the number of passes over the text.
+    
+    Patterns are matched case-sensitively against text that the caller has
+    already lowercased, so they should be written in lowercase. Leaving
+    IGNORECASE off keeps the regex engine's first-character prefilter.
+    Lowercasing cannot stand in for IGNORECASE on texts with characters
+    such as 'ſ' (see ``_TokenizedText.case_aligned``), so ``find`` takes
+    ``ignore_case`` for those; the IGNORECASE regexes are compiled on
+    first use.
+    
+    The alternation reports one branch per position, so after each hit
+    the other branches that could also match there are re-checked. Only
+    branches that can start with the hit's character are tried, looked up
+    in buckets keyed by each pattern's possible first characters (see
+    ``_first_chars``); patterns whose first character cannot be bounded,
+    and every pattern under IGNORECASE, are always tried. From
+    ``GROUP_MIN_PATTERNS`` patterns on, the fused regex is laid out by the
+    same buckets, each behind a one-character lookahead, so the engine
+    tries only the branches that can start at a position instead of all
+    of them. The lookaheads cost the first-character prefilter, which is
+    the better deal for small sets.
+    """
+    
+    GROUP_MIN_PATTERNS = 64
+    
+    def __init__(self, patterns: List[str]):
+        self.patterns: List[str] = []
+        self.add(*patterns)
+    
+    def add(self, *patterns: str) -> None:
+        """Add one or more patterns and recompile the fused regex."""
+        self.patterns.extend(patterns)
+        self._compiled = {False: self._compile(0)}
+    
+    def _compile(
+        self,
+        flags: int,
+    ) -> Tuple[re.Pattern, List[int], List[re.Pattern], Dict[str, List[int]], List[int], bool]:
+        """
+        The fused regex and the tables ``find`` reads alongside it.
+        
+        Returns:
+            (fused, owners, branches, buckets, anywhere, grouped):
+            ``owners`` maps the fused regex's tag groups to pattern
+            indices, ``buckets`` maps a first character to the sorted
+            indices of the patterns that can start with it, ``anywhere``
+            lists the other patterns, and ``grouped`` says whether the
+            fused regex is laid out by bucket, unbounded patterns first
+        """
+        branches = [re.compile(p, flags) for p in self.patterns]
+        everything = list(range(len(self.patterns)))
+        if flags & re.IGNORECASE:
+            fused, owners = self._fuse([('', everything)], flags)
+            return fused, owners, branches, {}, everything, False
+        
+        first = [_first_chars(p) for p in self.patterns]
+        anywhere = [i for i, chars in enumerate(first) if chars is None]
+        buckets: Dict[str, List[int]] = {}
+        for i, chars in enumerate(first):
+            for ch in sorted(chars or ()):
+                buckets.setdefault(ch, []).append(i)
+        if len(self.patterns) >= self.GROUP_MIN_PATTERNS:
+            groups = [('', anywhere)]
+            groups.extend((f'(?={re.escape(ch)})', bucket) for ch, bucket in buckets.items())
+            try:
+                fused, owners = self._fuse(groups, flags)
+                return fused, owners, branches, buckets, anywhere, True
+            except re.error:
+                # e.g. a named group in a pattern repeated across buckets
+                pass
+        fused, owners = self._fuse([('', everything)], flags)
+        return fused, owners, branches, buckets, anywhere, False
+    
+    def _fuse(
+        self,
+        groups: List[Tuple[str, List[int]]],
+        flags: int,
+    ) -> Tuple[re.Pattern, List[int]]:
+        """One alternation over guarded groups of patterns, each branch tagged."""
+        owners: List[int] = []
+        alternatives = []
+        for guard, indices in groups:
+            if not indices:
+                continue
+            tagged = []
+            for i in indices:
+                tagged.append(f'(?:{self.patterns[i]})(?P<_g{len(owners)}>)')
+                owners.append(i)
+            alternatives.append(f'{guard}(?:{"|".join(tagged)})' if guard else '|'.join(tagged))
+        return re.compile('|'.join(alternatives), flags), owners
+    
+    def find(self, text: str, ignore_case: bool = False) -> List[int]:
+        """Return the sorted indices of all patterns that occur in ``text``."""
+        if ignore_case not in self._compiled:
+            self._compiled[ignore_case] = self._compile(re.IGNORECASE)
+        fused, owners, branches, buckets, anywhere, grouped = self._compiled[ignore_case]
+        search = fused.search
+        remaining = len(self.patterns)
+        found = set()
+        pos = 0
+        
+        while remaining:
+            match = search(text, pos)
+            if match is None:
+                break
+            start = match.start()
+            idx = owners[int(match.lastgroup[2:])]
+            if idx not in found:
+                found.add(idx)
+                remaining -= 1
+            # The alternation reports only the first branch matching at this
+            # position, so check the others that can start here and come
+            # after it: in pattern order, or unbounded patterns first when
+            # grouped
+            bucket = buckets.get(text[start], ()) if start < len(text) else ()
+            after_bucket = islice(bucket, bisect_right(bucket, idx), None)
+            position = bisect_right(anywhere, idx)
+            after_anywhere = islice(anywhere, position, None)
+            if not grouped:
+                later = chain(after_bucket, after_anywhere)
+            elif position and anywhere[position - 1] == idx:
+                later = chain(after_anywhere, bucket)
+            else:
+                later = after_bucket
+            for other in later:
+                if other not in found and branches[other].match(text, start):
+                    found.add(other)
+                    remaining -= 1
+            pos = start + 1
+        
+        return sorted(found)
+
 
 @dataclass
 class FilterResult:
@@ -110,6 +564,296 @@ class FilterResult:
     person_references: List[str]
 
 
+class ResultCache:
+    """
+    Content-hash cache of scoring results.
+    
+    Entries are keyed by a hash of the text, scoped to a fingerprint of the
+    filter configuration, so a change to weights, threshold, keyword table
+    or patterns makes earlier entries unreachable. A bounded in-memory LRU
+    sits in front of an optional SQLite file that persists across runs;
+    rows written under a different fingerprint are dropped when the file
+    is opened. Disk writes are buffered until ``flush()``.
+    
+    Hit and miss counters are per process.
+    """
+    
+    FLUSH_EVERY = 1000
+    
+    def __init__(self, fingerprint: str, max_size: int = 0, path: Optional[str] = None):
+        self.fingerprint = fingerprint
+        self.max_size = max_size
+        self.path = path
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0}
+        
+        self._memory: OrderedDict = OrderedDict()
+        self._pending: List[Tuple[str, str, str]] = []
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, timeout=60)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "fingerprint TEXT, text_hash TEXT, value TEXT, "
+                "PRIMARY KEY (fingerprint, text_hash))"
+            )
+            self._db.execute("DELETE FROM results WHERE fingerprint != ?", (fingerprint,))
+            self._db.commit()
+    
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[tuple]:
+        """Return the cached entry for a text hash, or None."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry
+        
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT value FROM results WHERE fingerprint = ? AND text_hash = ?",
+                (self.fingerprint, key),
+            ).fetchone()
+            if row is not None:
+                entry = _decode_entry(row[0])
+                self._remember(key, entry)
+                self.stats['hits'] += 1
+                self.stats['disk_hits'] += 1
+                return entry
+        
+        self.stats['misses'] += 1
+        return None
+    
+    def put(self, key: str, entry: tuple) -> None:
+        self._remember(key, entry)
+        if self._db is not None:
+            self._pending.append((self.fingerprint, key, json.dumps(entry)))
+            if len(self._pending) >= self.FLUSH_EVERY:
+                self.flush()
+    
+    def flush(self) -> None:
+        """Write buffered entries to the persistent store."""
+        if self._db is not None and self._pending:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?)", self._pending
+            )
+            self._db.commit()
+            self._pending = []
+    
+    def _remember(self, key: str, entry: tuple) -> None:
+        if self.max_size <= 0:
+            return
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+
+def _decode_entry(value: str) -> tuple:
+    """Rebuild a cache entry from its JSON form (keyword pairs as tuples)."""
+    entry = json.loads(value)
+    entry[6] = [tuple(pair) for pair in entry[6]]
+    return tuple(entry)
+
+
+@dataclass
+class BatchScores:
+    """
+    Columnar scores for a batch of texts.
+    
+    Each field is a NumPy array with one element per input text, in input
+    order. No explanations (detected keywords, patterns, people) are kept.
+    """
+    relevance_score: np.ndarray
+    keyword_score: np.ndarray
+    pronoun_ratio: np.ndarray
+    shared_goal_score: np.ndarray
+    multi_person_score: np.ndarray
+    is_household_relevant: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.relevance_score)
+
+
+class FilterProfile:
+    """
+    Opt-in timing of full scoring, per signal and per record.
+    
+    Accumulates wall time and call counts for each of the four signals,
+    and per-record latency bucketed by word count. Recording a record
+    costs five clock reads and a few additions, so it can stay on in
+    batch runs. Covers the full scoring path (``score``, ``score_from_hits``,
+    ``filter_dataset``, ``filter_stream``); cache hits and ``decide`` /
+    ``score_batch`` are not timed.
+    """
+    
+    # Upper word-count edge of each latency bucket; the last bucket is open
+    WORD_BUCKETS = (50, 100, 200, 500, 1000)
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self) -> None:
+        self.signal_seconds = dict.fromkeys(SIGNAL_NAMES, 0.0)
+        self.signal_calls = dict.fromkeys(SIGNAL_NAMES, 0)
+        n_buckets = len(self.WORD_BUCKETS) + 1
+        self.bucket_records = [0] * n_buckets
+        self.bucket_seconds = [0.0] * n_buckets
+        self.bucket_max_seconds = [0.0] * n_buckets
+    
+    def record(self, n_words: int, marks: List[float]) -> None:
+        """
+        Add one scored record.
+        
+        Args:
+            n_words: Word tokens in the record
+            marks: Clock readings before the first signal and after each
+                signal, in SIGNAL_NAMES order (five values)
+        """
+        for i, name in enumerate(SIGNAL_NAMES):
+            self.signal_seconds[name] += marks[i + 1] - marks[i]
+            self.signal_calls[name] += 1
+        elapsed = marks[-1] - marks[0]
+        bucket = bisect_right(self.WORD_BUCKETS, n_words)
+        self.bucket_records[bucket] += 1
+        self.bucket_seconds[bucket] += elapsed
+        if elapsed > self.bucket_max_seconds[bucket]:
+            self.bucket_max_seconds[bucket] = elapsed
+    
+    def merge(self, other: 'FilterProfile') -> None:
+        """Add the counters of another profile (e.g. from a worker)."""
+        for name in SIGNAL_NAMES:
+            self.signal_seconds[name] += other.signal_seconds[name]
+            self.signal_calls[name] += other.signal_calls[name]
+        for i, count in enumerate(other.bucket_records):
+            self.bucket_records[i] += count
+            self.bucket_seconds[i] += other.bucket_seconds[i]
+            self.bucket_max_seconds[i] = max(
+                self.bucket_max_seconds[i], other.bucket_max_seconds[i]
+            )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready summary of the counters."""
+        total = sum(self.signal_seconds.values())
+        signals = {
+            name: {
+                'calls': self.signal_calls[name],
+                'seconds': round(self.signal_seconds[name], 6),
+                'mean_us': _mean_us(self.signal_seconds[name], self.signal_calls[name]),
+                'share': round(self.signal_seconds[name] / total, 4) if total else 0.0,
+            }
+            for name in SIGNAL_NAMES
+        }
+        
+        lower_edges = (0,) + self.WORD_BUCKETS
+        by_word_count = []
+        for i, count in enumerate(self.bucket_records):
+            upper = self.WORD_BUCKETS[i] - 1 if i < len(self.WORD_BUCKETS) else None
+            by_word_count.append({
+                'words': f"{lower_edges[i]}-{upper}" if upper is not None else f"{lower_edges[i]}+",
+                'records': count,
+                'mean_us': _mean_us(self.bucket_seconds[i], count),
+                'max_us': round(self.bucket_max_seconds[i] * 1e6, 1),
+            })
+        
+        records = sum(self.bucket_records)
+        seconds = sum(self.bucket_seconds)
+        return {
+            'records': records,
+            'seconds': round(seconds, 6),
+            'records_per_second': round(records / seconds, 1) if seconds else 0.0,
+            'signals': signals,
+            'latency_by_word_count': by_word_count,
+        }
+    
+    def dump(self, path: str) -> None:
+        """Write ``to_dict()`` as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def _mean_us(seconds: float, count: int) -> float:
+    return round(seconds / count * 1e6, 1) if count else 0.0
+
+
+class HouseholdPrefilter:
+    """
+    Cheap first stage that rejects records which cannot reach the threshold.
+    
+    Computes an upper bound on the relevance score from checks far cheaper
+    than full scoring, and only forwards records whose bound reaches
+    ``relevance_threshold``:
+    
+    - keyword: plain substring checks in descending specificity, stopping
+      at the first keyword present (exact under substring matching, and an
+      upper bound when word boundaries are enforced)
+    - pronoun: 1 if any plural first-person token occurs, else exactly 0
+    - shared goal: computed exactly with the fused goal regex
+    - multi-person: 1 if either person pattern can match, else exactly 0
+    
+    The bound never undercuts the true score, so a rejected record would
+    also have been dropped by ``HouseholdFilter.score``.
+    """
+    
+    def __init__(self, household_filter: 'HouseholdFilter'):
+        self.household_filter = household_filter
+        
+        # Highest specificity first, so the scan can stop at the first hit
+        self._keywords = sorted(household_filter._keywords, key=lambda item: -item[1])
+        
+        self._plural_pattern = re.compile(
+            r'\b(?:' + '|'.join(sorted(PLURAL_FIRST_PERSON)) + r')\b'
+        )
+        self.stats = {'records': 0, 'rejected': 0}
+    
+    def upper_bound(self, text: str) -> float:
+        """
+        Upper bound on ``score(text).relevance_score``.
+        
+        Stops refining as soon as the bound falls below the threshold, so
+        the value returned for rejected records may be looser than needed.
+        """
+        hf = self.household_filter
+        config = hf.config
+        cutoff = config.relevance_threshold - _DECISION_MARGIN
+        tokenized = _TokenizedText(text)
+        lower = tokenized.lower
+        
+        keyword_bound = next(
+            (specificity for keyword, specificity in self._keywords if keyword in lower), 0.0
+        )
+        pronoun_bound = 1.0 if self._plural_pattern.search(lower) else 0.0
+        partial = config.keyword_weight * keyword_bound + config.pronoun_weight * pronoun_bound
+        bound = partial + config.shared_goal_weight + config.multi_person_weight
+        if bound < cutoff:
+            return bound
+        
+        shared_goal = hf._shared_goal_value(tokenized)
+        partial += config.shared_goal_weight * shared_goal
+        bound = partial + config.multi_person_weight
+        if bound < cutoff:
+            return bound
+        
+        # The lowercase person patterns lack the leading \b, so they match a
+        # superset of true references; texts needing the case-insensitive
+        # fallback are not checked at all
+        if tokenized.case_aligned and not any(
+            pattern.search(lower) for _, pattern in hf._person_patterns_lower
+        ):
+            return partial
+        return bound
+    
+    def may_pass(self, text: str) -> bool:
+        """False only if ``text`` provably falls below the threshold."""
+        keep = self.upper_bound(text) >= self.household_filter.config.relevance_threshold - _DECISION_MARGIN
+        self.stats['records'] += 1
+        if not keep:
+            self.stats['rejected'] += 1
+        return keep
+
+
 class HouseholdFilter:
     """
     Filter for identifying household-relevant financial records.
@@ -121,20 +865,184 @@ class HouseholdFilter:
             # Include in dataset
     """
     
-    def __init__(self, config: Optional[HouseholdFilterConfig] = None):
+    def __init__(
+        self,
+        config: Optional[HouseholdFilterConfig] = None,
+        keywords: Optional[Dict[str, float]] = None,
+        goal_patterns: Optional[List[str]] = None,
+        cache_size: int = 0,
+        cache_path: Optional[str] = None,
+        profile: bool = False,
+        keyword_matcher: Optional[KeywordAutomaton] = None,
+    ):
         self.config = config or HouseholdFilterConfig()
         
-        # Compile regex patterns
-        self._goal_patterns = [
-            re.compile(pattern, re.IGNORECASE) 
-            for pattern in SHARED_GOAL_PATTERNS
-        ]
+        # Keyword table compiled once into a single-pass matcher, unless a
+        # prebuilt one (from an artefact or the parent process) is given
+        self._keywords = list((keywords or HOUSEHOLD_KEYWORDS).items())
+        if keyword_matcher is None:
+            keyword_matcher = KeywordAutomaton(
+                [keyword for keyword, _ in self._keywords],
+                word_boundaries=self.config.keyword_word_boundaries,
+            )
+        self._keyword_matcher = keyword_matcher
+        
+        # Shared goal patterns fused into a single-scan regex
+        self._goal_patterns = GoalPatternSet(goal_patterns or SHARED_GOAL_PATTERNS)
+        
+        # Person reference patterns. The lowercase variants omit the leading
+        # \b so the regex engine can use its literal prefix search; the
+        # boundary is checked on each hit instead.
+        self._person_patterns = []
+        self._person_patterns_lower = []
+        for first, second in PERSON_REFERENCE_PATTERNS:
+            body = f"({'|'.join(first)}) ({'|'.join(second)})\\b"
+            self._person_patterns.append(re.compile(r'\b' + body, re.IGNORECASE))
+            self._person_patterns_lower.append((first, re.compile(body)))
+        
+        # Score-only signal functions and weights, keyed by SIGNAL_NAMES
+        self._signal_fns = {
+            'keyword': self._keyword_value,
+            'pronoun': self._calculate_pronoun_ratio,
+            'shared_goal': self._shared_goal_value,
+            'multi_person': self._multi_person_value,
+        }
+        self._signal_weights = {
+            'keyword': self.config.keyword_weight,
+            'pronoun': self.config.pronoun_weight,
+            'shared_goal': self.config.shared_goal_weight,
+            'multi_person': self.config.multi_person_weight,
+        }
+        
+        # Early-exit bookkeeping for decide()
+        self.decision_counts = {'records': 0, 'signals_evaluated': 0}
+        
+        self.prefilter = HouseholdPrefilter(self)
+        
+        # Optional result cache for repeated texts (score() only)
+        self.cache: Optional[ResultCache] = None
+        if cache_size > 0 or cache_path:
+            self.cache = ResultCache(self.fingerprint(), max_size=cache_size, path=cache_path)
+        
+        # Optional per-signal timing of full scoring
+        self.profile: Optional[FilterProfile] = FilterProfile() if profile else None
+    
+    def fingerprint(self) -> str:
+        """Hash of everything that affects scoring: config, keywords and patterns."""
+        return _hash_state({
+            'config': asdict(self.config),
+            'signals': self.signal_fingerprint(),
+        })
+    
+    def signal_fingerprint(self) -> str:
+        """
+        Hash of what determines the four component signals.
+        
+        Weights and threshold are excluded: component vectors stay valid
+        when only those change.
+        """
+        return _source_checksum(
+            self._keywords, self.config.keyword_word_boundaries, self._goal_patterns.patterns,
+        )
+    
+    def save_artefact(self, path: str) -> None:
+        """
+        Save the compiled matcher state as a versioned artefact (.npz).
+        
+        Holds the keyword automaton as flat arrays alongside a JSON header
+        with the format version, config, keyword table, goal patterns and a
+        checksum of those source tables, plus a checksum over the whole
+        file contents. Load it with ``from_artefact``.
+        
+        Regexes (goal and person patterns) are stored as source: CPython
+        cannot persist compiled patterns, and they compile in milliseconds.
+        """
+        header = json.dumps({
+            'version': FILTER_ARTEFACT_VERSION,
+            'source_checksum': self.signal_fingerprint(),
+            'config': asdict(self.config),
+            'keywords': self._keywords,
+            'goal_patterns': self._goal_patterns.patterns,
+        })
+        tables = self._keyword_matcher.to_tables()
+        np.savez(
+            path,
+            header=np.array(header),
+            checksum=np.array(_artefact_checksum(header, tables)),
+            **tables,
+        )
+    
+    @classmethod
+    def from_artefact(
+        cls,
+        path: str,
+        config: Optional[HouseholdFilterConfig] = None,
+        keywords: Optional[Dict[str, float]] = None,
+        goal_patterns: Optional[List[str]] = None,
+        **kwargs,
+    ) -> 'HouseholdFilter':
+        """
+        Build a filter from a ``save_artefact`` file without recompiling
+        the keyword automaton.
+        
+        The artefact is checked against the source tables the caller
+        expects (by default the module's HOUSEHOLD_KEYWORDS and
+        SHARED_GOAL_PATTERNS), so a stale artefact is never used silently.
+        
+        Args:
+            path: Artefact file
+            config: Filter config (default: the one stored in the artefact).
+                Weights and threshold may differ; word-boundary matching
+                must match the artefact.
+            keywords: Expected keyword table
+            goal_patterns: Expected goal patterns
+            **kwargs: Passed to the constructor (cache_size, profile, ...)
+            
+        Raises:
+            ValueError: If the artefact is corrupt, from another format
+                version, or built from different source tables
+        """
+        with np.load(path) as data:
+            header = str(data['header'])
+            tables = {name: data[name] for name in _AUTOMATON_TABLES}
+            checksum = str(data['checksum'])
+        payload = json.loads(header)
+        if payload.get('version') != FILTER_ARTEFACT_VERSION:
+            raise ValueError(
+                f"Unsupported filter artefact version {payload.get('version')} "
+                f"(expected {FILTER_ARTEFACT_VERSION}): {path}"
+            )
+        if checksum != _artefact_checksum(header, tables):
+            raise ValueError(f"Filter artefact checksum mismatch: {path}")
         
-        # Person reference patterns
-        self._person_patterns = [
-            re.compile(r'\b(my|our) (partner|spouse|husband|wife|son|daughter|kid|child|mom|dad|mother|father)\b', re.IGNORECASE),
-            re.compile(r'\b(he|she|they) (said|thinks|wants|needs|spent|bought)\b', re.IGNORECASE),
-        ]
+        config = config or HouseholdFilterConfig(**payload['config'])
+        expected = _source_checksum(
+            list((keywords or HOUSEHOLD_KEYWORDS).items()),
+            config.keyword_word_boundaries,
+            list(goal_patterns or SHARED_GOAL_PATTERNS),
+        )
+        if expected != payload['source_checksum']:
+            raise ValueError(
+                f"Filter artefact {path} was built from different keyword, "
+                "pattern or boundary settings; rebuild it with save_artefact()"
+            )
+        
+        keyword_table = {keyword: specificity for keyword, specificity in payload['keywords']}
+        matcher = KeywordAutomaton.from_tables(
+            list(keyword_table), tables, word_boundaries=config.keyword_word_boundaries,
+        )
+        return cls(
+            config,
+            keywords=keyword_table,
+            goal_patterns=payload['goal_patterns'],
+            keyword_matcher=matcher,
+            **kwargs,
+        )
+    
+    def flush_cache(self) -> None:
+        """Persist buffered cache entries, if a cache file is configured."""
+        if self.cache is not None:
+            self.cache.flush()
     
     def score(self, text: str) -> FilterResult:
         """
@@ -146,26 +1054,99 @@ class HouseholdFilter:
         Returns:
             FilterResult with score and component breakdown
         """
-        text_lower = text.lower()
+        if self.cache is not None:
+            key = ResultCache.text_hash(text)
+            entry = self.cache.get(key)
+            if entry is not None:
+                return _result_from_entry(text, entry)
+        
+        result = self._score_tokenized(_TokenizedText(text))
+        if self.cache is not None:
+            self.cache.put(key, _entry_from_result(result))
+        return result
+    
+    def score_from_hits(
+        self,
+        text: str,
+        keyword_hits: List[int],
+        goal_hits: List[int],
+    ) -> FilterResult:
+        """
+        Score a text whose keyword and goal matches were found elsewhere.
+        
+        For callers that already scanned the lowercased text against
+        ``keywords`` and ``goal_patterns`` (e.g. a fused preprocessing scan),
+        so those signals are not scanned a second time. Goal hits are
+        recomputed for texts that are not ``case_aligned``, since a
+        case-sensitive scan of the lowercased text can miss them. The
+        cache is not consulted.
+        
+        Args:
+            text: The financial text to analyse
+            keyword_hits: Sorted indices into ``keywords`` found in the text
+            goal_hits: Sorted indices into ``goal_patterns`` found in the text
+        """
+        tokenized = _TokenizedText(text)
+        if not tokenized.case_aligned:
+            goal_hits = None
+        return self._score_tokenized(tokenized, keyword_hits, goal_hits)
+    
+    @property
+    def keywords(self) -> List[Tuple[str, float]]:
+        """The (keyword, specificity) table, in matching order."""
+        return list(self._keywords)
+    
+    @property
+    def goal_patterns(self) -> List[str]:
+        """The shared goal patterns, in matching order."""
+        return list(self._goal_patterns.patterns)
+    
+    def find_keywords(self, lower: str) -> List[int]:
+        """
+        Indices into ``keywords`` found in a lowercased text, sorted.
+        
+        Uses the keyword automaton, with the filter's substring or
+        whole-word semantics, so the cost of a scan does not grow with the
+        size of the vocabulary.
+        """
+        return self._keyword_matcher.find(lower)
+    
+    def _score_tokenized(
+        self,
+        tokenized: _TokenizedText,
+        keyword_hits: Optional[List[int]] = None,
+        goal_hits: Optional[List[int]] = None,
+    ) -> FilterResult:
+        """Build the full FilterResult for a tokenised record."""
+        text = tokenized.text
+        profile = self.profile
+        if profile is not None:
+            marks = [time.perf_counter()]
         
         # Signal 1: Explicit keywords
-        keyword_score, detected_keywords = self._score_keywords(text_lower)
+        keyword_score, detected_keywords = self._score_keywords(tokenized.lower, keyword_hits)
+        if profile is not None:
+            marks.append(time.perf_counter())
         
         # Signal 2: Plural pronoun ratio
-        pronoun_ratio = self._calculate_pronoun_ratio(text_lower)
+        pronoun_ratio = self._calculate_pronoun_ratio(tokenized)
+        if profile is not None:
+            marks.append(time.perf_counter())
         
         # Signal 3: Shared goal patterns
-        shared_goal_score, detected_patterns = self._score_shared_goals(text_lower)
+        shared_goal_score, detected_patterns = self._score_shared_goals(tokenized, goal_hits)
+        if profile is not None:
+            marks.append(time.perf_counter())
         
         # Signal 4: Multiple person references
-        multi_person_score, person_refs = self._score_multi_person(text)
+        multi_person_score, person_refs = self._score_multi_person(tokenized)
+        if profile is not None:
+            marks.append(time.perf_counter())
+            profile.record(len(tokenized.tokens), marks)
         
         # Weighted combination
-        relevance_score = (
-            self.config.keyword_weight * keyword_score +
-            self.config.pronoun_weight * pronoun_ratio +
-            self.config.shared_goal_weight * shared_goal_score +
-            self.config.multi_person_weight * multi_person_score
+        relevance_score = self._relevance(
+            keyword_score, pronoun_ratio, shared_goal_score, multi_person_score
         )
         
         return FilterResult(
@@ -181,70 +1162,501 @@ class HouseholdFilter:
             person_references=person_refs,
         )
     
-    def _score_keywords(self, text: str) -> Tuple[float, List[Tuple[str, float]]]:
-        """Score based on household-indicating keywords."""
-        detected = []
-        max_score = 0.0
+    def decide(self, text: str) -> bool:
+        """
+        Decision-only relevance check with early exit.
         
-        for keyword, specificity in HOUSEHOLD_KEYWORDS.items():
-            if keyword in text:
-                detected.append((keyword, specificity))
-                max_score = max(max_score, specificity)
+        Evaluates signals cheapest first and stops as soon as the keep/drop
+        outcome against ``relevance_threshold`` is settled: either the
+        weighted partial sum already reaches the threshold, or the weight
+        still outstanding can no longer lift it there. Returns the same
+        decision as ``score(text).is_household_relevant``.
+        """
+        tokenized = _TokenizedText(text)
+        threshold = self.config.relevance_threshold
+        weights = self._signal_weights
+        
+        values = {}
+        partial = 0.0
+        remaining = sum(weights.values())
+        decision = None
+        for name in _DECISION_ORDER:
+            values[name] = self._signal_fns[name](tokenized)
+            partial += weights[name] * values[name]
+            remaining -= weights[name]
+            if partial >= threshold + _DECISION_MARGIN:
+                decision = True
+                break
+            if partial + remaining < threshold - _DECISION_MARGIN:
+                decision = False
+                break
+        
+        if decision is None:
+            decision = self._relevance(*(values[name] for name in SIGNAL_NAMES)) >= threshold
+        
+        self.decision_counts['records'] += 1
+        self.decision_counts['signals_evaluated'] += len(values)
+        return decision
+    
+    def decide_batch(
+        self,
+        texts: Iterable[str],
+        num_workers: int = 1,
+        chunk_size: int = 1000,
+    ) -> np.ndarray:
+        """
+        Boolean keep mask for many texts, using decide().
+        
+        ``decision_counts`` only tracks in-process calls; evaluations made
+        in worker processes are not reported back.
+        """
+        if num_workers > 1:
+            chunks = ((None, chunk) for chunk in _chunked(texts, chunk_size))
+            blocks = [
+                block for _, block in
+                self._map_chunks(_decide_chunk, chunks, num_workers)
+            ]
+            return np.concatenate(blocks) if blocks else np.empty(0, dtype=bool)
+        return np.array([self.decide(text) for text in texts], dtype=bool)
+    
+    def score_batch(
+        self,
+        texts: Iterable[str],
+        num_workers: int = 1,
+        chunk_size: int = 1000,
+    ) -> BatchScores:
+        """
+        Score-only fast path for many texts.
+        
+        Computes the four component signals without building a
+        FilterResult or any explanation lists per record.
+        
+        Args:
+            texts: Text records to score
+            num_workers: Worker processes to score with (1 = in-process)
+            chunk_size: Texts per task sent to a worker
+            
+        Returns:
+            BatchScores with one entry per text
+        """
+        if num_workers > 1:
+            chunks = ((None, chunk) for chunk in _chunked(texts, chunk_size))
+            blocks = [
+                block for _, block in
+                self._map_chunks(_components_chunk, chunks, num_workers)
+            ]
+            components = np.concatenate(blocks) if blocks else np.empty((0, 4))
+        else:
+            components = self.component_matrix(texts)
+        return self.scores_from_components(components)
+    
+    def component_matrix(self, texts: Iterable[str]) -> np.ndarray:
+        """Return an (n, 4) float64 array of the four component signals."""
+        rows = [self._component_values(_TokenizedText(text)) for text in texts]
+        return np.array(rows, dtype=np.float64).reshape(len(rows), 4)
+    
+    def scores_from_components(self, components: np.ndarray) -> BatchScores:
+        """Combine an (n, 4) component matrix under this filter's config."""
+        keyword, pronoun, goal, person = components.T
+        # Same operation order as score(), so results match it bit for bit
+        relevance = self._relevance(keyword, pronoun, goal, person)
+        return BatchScores(
+            relevance_score=relevance,
+            keyword_score=keyword,
+            pronoun_ratio=pronoun,
+            shared_goal_score=goal,
+            multi_person_score=person,
+            is_household_relevant=relevance >= self.config.relevance_threshold,
+        )
+    
+    def _relevance(self, keyword_score, pronoun_ratio, shared_goal_score, multi_person_score):
+        """Weighted combination of the component scores (floats or arrays)."""
+        return (
+            self.config.keyword_weight * keyword_score +
+            self.config.pronoun_weight * pronoun_ratio +
+            self.config.shared_goal_weight * shared_goal_score +
+            self.config.multi_person_weight * multi_person_score
+        )
+    
+    def _component_values(self, tokenized: _TokenizedText) -> Tuple[float, float, float, float]:
+        """The four component scores, without explanations."""
+        fns = self._signal_fns
+        return tuple(fns[name](tokenized) for name in SIGNAL_NAMES)
+    
+    def _keyword_value(self, tokenized: _TokenizedText) -> float:
+        keywords = self._keywords
+        return max(
+            (keywords[i][1] for i in self._keyword_matcher.find(tokenized.lower)),
+            default=0.0,
+        )
+    
+    def _shared_goal_value(self, tokenized: _TokenizedText) -> float:
+        return min(len(self._goal_hits(tokenized)) / 3.0, 1.0)
+    
+    def _goal_hits(self, tokenized: _TokenizedText) -> List[int]:
+        """Goal pattern indices, matched case-insensitively where lowercasing falls short."""
+        return self._goal_patterns.find(tokenized.lower, ignore_case=not tokenized.case_aligned)
+    
+    def _multi_person_value(self, tokenized: _TokenizedText) -> float:
+        score, _ = self._score_multi_person(tokenized)
+        return score
+    
+    def _score_keywords(
+        self,
+        text: str,
+        hits: Optional[List[int]] = None,
+    ) -> Tuple[float, List[Tuple[str, float]]]:
+        """Score based on household-indicating keywords."""
+        if hits is None:
+            hits = self._keyword_matcher.find(text)
+        # Indices are sorted, preserving keyword table order
+        detected = [self._keywords[i] for i in hits]
+        max_score = max((specificity for _, specificity in detected), default=0.0)
         
         # Use max specificity (not sum) to avoid over-counting
         return max_score, detected
     
-    def _calculate_pronoun_ratio(self, text: str) -> float:
+    def _calculate_pronoun_ratio(self, tokenized: _TokenizedText) -> float:
         """Calculate ratio of plural first-person to all first-person pronouns."""
-        words = re.findall(r'\b\w+\b', text)
+        counts = tokenized.counts
         
-        plural_count = sum(1 for w in words if w in PLURAL_FIRST_PERSON)
-        total_first_person = sum(1 for w in words if w in ALL_FIRST_PERSON)
+        plural_count = sum(counts[w] for w in PLURAL_FIRST_PERSON)
+        total_first_person = sum(counts[w] for w in ALL_FIRST_PERSON)
         
         if total_first_person == 0:
             return 0.0
         
         return plural_count / total_first_person
     
-    def _score_shared_goals(self, text: str) -> Tuple[float, List[str]]:
+    def _score_shared_goals(
+        self,
+        tokenized: _TokenizedText,
+        hits: Optional[List[int]] = None,
+    ) -> Tuple[float, List[str]]:
         """Score based on shared goal language patterns."""
-        detected = []
-        
-        for pattern in self._goal_patterns:
-            matches = pattern.findall(text)
-            if matches:
-                detected.append(pattern.pattern)
+        if hits is None:
+            hits = self._goal_hits(tokenized)
+        patterns = self._goal_patterns.patterns
+        detected = [patterns[i] for i in hits]
         
         # Score based on number of distinct patterns (capped at 1.0)
         score = min(len(detected) / 3.0, 1.0)
         return score, detected
     
-    def _score_multi_person(self, text: str) -> Tuple[float, List[str]]:
+    def _score_multi_person(self, tokenized: _TokenizedText) -> Tuple[float, List[str]]:
         """Score based on references to multiple distinct people."""
+        text = tokenized.text
         detected = []
         
-        for pattern in self._person_patterns:
-            matches = pattern.findall(text)
-            for match in matches:
-                detected.append(' '.join(match) if isinstance(match, tuple) else match)
+        if not tokenized.case_aligned:
+            for pattern in self._person_patterns:
+                matches = pattern.findall(text)
+                for match in matches:
+                    detected.append(' '.join(match) if isinstance(match, tuple) else match)
+        else:
+            lower = tokenized.lower
+            counts = tokenized.counts
+            for first, pattern in self._person_patterns_lower:
+                # Every match starts with a whole token from ``first``
+                if not any(w in counts for w in first):
+                    continue
+                pos = 0
+                while True:
+                    match = pattern.search(lower, pos)
+                    if match is None:
+                        break
+                    start, end = match.span()
+                    if start and _is_word_char(lower[start - 1]):
+                        pos = start + 1
+                        continue
+                    # Report the original casing, as findall on ``text`` would
+                    detected.append(' '.join(
+                        text[a:b] for a, b in (match.span(1), match.span(2))
+                    ))
+                    pos = end
         
         # Score based on number of person references (capped at 1.0)
         score = min(len(set(detected)) / 2.0, 1.0)
         return score, list(set(detected))
     
-    def filter_dataset(self, texts: List[str]) -> Tuple[List[str], List[FilterResult]]:
+    def filter_dataset(
+        self,
+        texts: List[str],
+        num_workers: int = 1,
+        chunk_size: int = 1000,
+        profile_path: Optional[str] = None,
+    ) -> Tuple[List[str], List[FilterResult]]:
         """
         Filter a list of texts to household-relevant records.
         
         Args:
             texts: List of text records to filter
+            num_workers: Worker processes to score with (1 = in-process)
+            chunk_size: Texts per task sent to a worker
+            profile_path: Write the accumulated profile here as JSON
+                (filter built with ``profile=True`` only)
             
         Returns:
             Tuple of (filtered_texts, all_results)
         """
-        results = [self.score(text) for text in texts]
+        if num_workers > 1:
+            results = list(self._score_parallel(texts, num_workers, chunk_size))
+        else:
+            results = [self.score(text) for text in texts]
         filtered = [r.text for r in results if r.is_household_relevant]
+        self.flush_cache()
+        if profile_path and self.profile is not None:
+            self.profile.dump(profile_path)
         return filtered, results
+    
+    def filter_stream(
+        self,
+        records: Iterable[Union[str, Dict[str, Any]]],
+        text_field: str = 'text',
+        num_workers: int = 1,
+        chunk_size: int = 1000,
+        prefilter: bool = False,
+    ) -> Iterator[Tuple[Union[str, Dict[str, Any]], float]]:
+        """
+        Lazily filter a stream of texts or records.
+        
+        Only a bounded window of records is held at any time, so memory
+        stays flat however large the input is.
+        
+        Args:
+            records: Iterable of raw texts, or dicts holding the text
+            text_field: Key of the text in dict records
+            num_workers: Worker processes to score with (1 = in-process)
+            chunk_size: Records per task sent to a worker
+            prefilter: Skip full scoring for records that HouseholdPrefilter
+                proves cannot reach the threshold (same output, less work)
+            
+        Yields:
+            (record, relevance_score) for each household-relevant record,
+            in input order
+        """
+        def text_of(record):
+            if isinstance(record, str):
+                return record
+            return record.get(text_field) or ''
+        
+        if num_workers <= 1:
+            for record in records:
+                text = text_of(record)
+                if prefilter and not self.prefilter.may_pass(text):
+                    continue
+                result = self.score(text)
+                if result.is_household_relevant:
+                    yield record, result.relevance_score
+            self.flush_cache()
+            return
+        
+        chunks = (
+            (chunk, [text_of(record) for record in chunk])
+            for chunk in _chunked(records, chunk_size)
+        )
+        func = _prefiltered_score_chunk if prefilter else _score_chunk
+        for chunk, (results, profile) in self._map_chunks(func, chunks, num_workers):
+            self._merge_profile(profile)
+            for record, result in zip(chunk, results):
+                if result is not None and result.is_household_relevant:
+                    yield record, result.relevance_score
+    
+    def _score_parallel(
+        self,
+        texts: Iterable[str],
+        num_workers: int,
+        chunk_size: int,
+    ) -> Iterator[FilterResult]:
+        """Score texts across a process pool, yielding results in input order."""
+        chunks = ((None, chunk) for chunk in _chunked(texts, chunk_size))
+        for _, (results, profile) in self._map_chunks(_score_chunk, chunks, num_workers):
+            self._merge_profile(profile)
+            yield from results
+    
+    def _merge_profile(self, profile: Optional[FilterProfile]) -> None:
+        if profile is not None and self.profile is not None:
+            self.profile.merge(profile)
+    
+    def _map_chunks(
+        self,
+        func: Callable[[List[str]], List],
+        chunks: Iterable[Tuple[Any, List[str]]],
+        num_workers: int,
+    ) -> Iterator[Tuple[Any, List]]:
+        """
+        Apply ``func`` to (tag, texts) chunks on a pool of filter workers.
+        
+        Yields (tag, func(texts)) in input order. At most two chunks per
+        worker are in flight, so the input is consumed only as fast as
+        results are taken.
+        """
+        worker_args = (
+            self.config,
+            dict(self._keywords),
+            list(self._goal_patterns.patterns),
+            self.cache.max_size if self.cache else 0,
+            self.cache.path if self.cache else None,
+            self.profile is not None,
+            self._keyword_matcher,
+        )
+        max_pending = 2 * num_workers
+        with Pool(num_workers, initializer=_init_worker, initargs=worker_args) as pool:
+            pending = deque()
+            for tag, texts in chunks:
+                pending.append((tag, pool.apply_async(func, (texts,))))
+                if len(pending) >= max_pending:
+                    tag, result = pending.popleft()
+                    yield tag, result.get()
+            while pending:
+                tag, result = pending.popleft()
+                yield tag, result.get()
+
+
+def save_components(
+    path: str,
+    record_index: Iterable[int],
+    components: np.ndarray,
+    household_filter: HouseholdFilter,
+) -> None:
+    """
+    Write per-record component vectors to a columnar sidecar (.npz).
+    
+    One float64 column per signal (named as in SIGNAL_NAMES) plus the
+    record index, so a new weight/threshold config can be applied later
+    with ``scores_from_components`` without rescanning any text.
+    """
+    components = np.asarray(components, dtype=np.float64).reshape(-1, 4)
+    columns = {name: components[:, i] for i, name in enumerate(SIGNAL_NAMES)}
+    np.savez_compressed(
+        path,
+        record_index=np.asarray(list(record_index), dtype=np.int64),
+        signal_fingerprint=np.array(household_filter.signal_fingerprint()),
+        config=np.array(json.dumps(asdict(household_filter.config))),
+        **columns,
+    )
+
+
+def load_components(path: str) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """
+    Read a component sidecar written by ``save_components``.
+    
+    Returns:
+        Tuple of (record_index, (n, 4) components, metadata)
+    """
+    with np.load(path) as data:
+        components = np.column_stack([data[name] for name in SIGNAL_NAMES])
+        metadata = {
+            'signal_fingerprint': str(data['signal_fingerprint']),
+            'config': json.loads(str(data['config'])),
+        }
+        return data['record_index'], components.reshape(-1, 4), metadata
+
+
+def _hash_state(state: Dict[str, Any]) -> str:
+    encoded = json.dumps(state, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _artefact_checksum(header: str, tables: Dict[str, np.ndarray]) -> str:
+    digest = hashlib.sha256(header.encode('utf-8'))
+    for name in _AUTOMATON_TABLES:
+        digest.update(np.ascontiguousarray(tables[name]).tobytes())
+    return digest.hexdigest()
+
+
+def _source_checksum(
+    keywords: List[Tuple[str, float]],
+    word_boundaries: bool,
+    goal_patterns: List[str],
+) -> str:
+    """Checksum of the source tables the compiled matchers are built from."""
+    return _hash_state({
+        'keywords': keywords,
+        'keyword_word_boundaries': word_boundaries,
+        'goal_patterns': goal_patterns,
+        'person_patterns': PERSON_REFERENCE_PATTERNS,
+    })
+
+
+# Per-process filter, built once by the pool initializer so each worker
+# compiles its matchers a single time rather than once per chunk
+_worker_filter: Optional[HouseholdFilter] = None
+
+
+def _init_worker(
+    config: HouseholdFilterConfig,
+    keywords: Dict[str, float],
+    goal_patterns: List[str],
+    cache_size: int = 0,
+    cache_path: Optional[str] = None,
+    profile: bool = False,
+    keyword_matcher: Optional[KeywordAutomaton] = None,
+) -> None:
+    global _worker_filter
+    _worker_filter = HouseholdFilter(
+        config, keywords=keywords, goal_patterns=goal_patterns,
+        cache_size=cache_size, cache_path=cache_path, profile=profile,
+        keyword_matcher=keyword_matcher,
+    )
+
+
+def _score_chunk(texts: List[str]) -> Tuple[List[FilterResult], Optional[FilterProfile]]:
+    results = [_worker_filter.score(text) for text in texts]
+    _worker_filter.flush_cache()
+    return results, _take_worker_profile()
+
+
+def _prefiltered_score_chunk(
+    texts: List[str],
+) -> Tuple[List[Optional[FilterResult]], Optional[FilterProfile]]:
+    """Like _score_chunk, with None for records the prefilter rejects."""
+    may_pass = _worker_filter.prefilter.may_pass
+    results = [_worker_filter.score(text) if may_pass(text) else None for text in texts]
+    _worker_filter.flush_cache()
+    return results, _take_worker_profile()
+
+
+def _take_worker_profile() -> Optional[FilterProfile]:
+    """Hand the worker's profile back for merging and start a fresh one."""
+    profile = _worker_filter.profile
+    if profile is not None:
+        _worker_filter.profile = FilterProfile()
+    return profile
+
+
+def _entry_from_result(result: FilterResult) -> tuple:
+    """FilterResult fields after ``text``, in declaration order."""
+    return (
+        result.relevance_score, result.is_household_relevant,
+        result.keyword_score, result.pronoun_ratio,
+        result.shared_goal_score, result.multi_person_score,
+        result.detected_keywords, result.detected_goal_patterns,
+        result.person_references,
+    )
+
+
+def _result_from_entry(text: str, entry: tuple) -> FilterResult:
+    # Copy the lists so callers cannot mutate the cached entry
+    return FilterResult(text, *entry[:6], *(list(items) for items in entry[6:]))
+
+
+def _components_chunk(texts: List[str]) -> np.ndarray:
+    return _worker_filter.component_matrix(texts)
+
+
+def _decide_chunk(texts: List[str]) -> np.ndarray:
+    return np.array([_worker_filter.decide(text) for text in texts], dtype=bool)
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Yield successive lists of up to ``size`` items."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
 
 
 def main():
@@ -0,0 +1,283 @@
+"""
+Envis Insight Engine - Household Graph Tensors
+
+Encodes the synthetic household structures attached by the preprocessing
+pipeline into the node features and edge lists HouseholdEncoder consumes,
+once, at preprocessing time.
+
+Node features (NODE_FEATURE_DIM = 25), as in model.HouseholdEncoder:
+- role one-hot (5): ROLE_TYPES
+- age bracket one-hot (6): AGE_BRACKETS
+- income bracket one-hot (4): INCOME_BRACKETS
+- goal participation (10): MAX_GOALS slots, zero until goal data exists
+
+Each relationship becomes two directed edges (both directions), with its
+EDGE_TYPES index alongside. Vocabularies follow household_encoder in
+config/model_config.yaml.
+
+Households take a bounded number of distinct forms (roles, brackets and
+relationships), so HouseholdGraphStore keeps each distinct graph once, in
+flat arrays, and maps every record to a graph id. On disk nodes are int8
+(role, age, income) indices; the float features are rebuilt on load. A
+data loader then only looks up ids and slices.
+"""
+
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+ROLE_TYPES = ("partner_1", "partner_2", "child", "parent", "other")
+AGE_BRACKETS = ("18-25", "25-35", "35-45", "45-55", "55-65", "65+")
+INCOME_BRACKETS = ("low", "medium", "high", "unknown")
+EDGE_TYPES = ("partner_partner", "parent_child", "other")
+MAX_GOALS = 10
+
+NODE_FEATURE_DIM = len(ROLE_TYPES) + len(AGE_BRACKETS) + len(INCOME_BRACKETS) + MAX_GOALS
+
+_AGE_OFFSET = len(ROLE_TYPES)
+_INCOME_OFFSET = _AGE_OFFSET + len(AGE_BRACKETS)
+
+# Bump when the feature layout or file format changes
+GRAPH_STORE_VERSION = 1
+
+
+def encode_household(household: Dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encode one household as graph tensors.
+
+    Unknown roles map to "other"; unknown age or income brackets leave
+    their one-hot block empty.
+
+    Returns:
+        Tuple of (node_features (n, NODE_FEATURE_DIM) float32,
+        edge_index (2, e) int64 of local node indices, edge_type (e,) int8)
+    """
+    attributes, edge_index, edge_type = encode_structure(household)
+    return node_features(attributes), edge_index, edge_type
+
+
+def node_features(attributes: np.ndarray) -> np.ndarray:
+    """One-hot node features from (n, 3) role/age/income indices (-1 = unknown)."""
+    features = np.zeros((len(attributes), NODE_FEATURE_DIM), dtype=np.float32)
+    rows = np.arange(len(attributes))
+    for column, offset in ((0, 0), (1, _AGE_OFFSET), (2, _INCOME_OFFSET)):
+        known = attributes[:, column] >= 0
+        features[rows[known], offset + attributes[known, column]] = 1.0
+    return features
+
+
+def encode_structure(household: Dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compact form of ``encode_household``.
+
+    Returns:
+        Tuple of (attributes (n, 3) int8 role/age/income indices, -1 for
+        unknown brackets; edge_index (2, e) int64; edge_type (e,) int8)
+    """
+    members = household["members"]
+    attributes = np.full((len(members), 3), -1, dtype=np.int8)
+    position = {}
+    for i, member in enumerate(members):
+        role = member["role"] if member["role"] in ROLE_TYPES else "other"
+        attributes[i, 0] = ROLE_TYPES.index(role)
+        if member.get("age_bracket") in AGE_BRACKETS:
+            attributes[i, 1] = AGE_BRACKETS.index(member["age_bracket"])
+        if member.get("income_bracket") in INCOME_BRACKETS:
+            attributes[i, 2] = INCOME_BRACKETS.index(member["income_bracket"])
+        position.setdefault(member["role"], i)
+
+    sources, targets, types = [], [], []
+    for source_role, target_role, relation in household["relationships"]:
+        if source_role not in position or target_role not in position:
+            continue
+        source, target = position[source_role], position[target_role]
+        relation_type = EDGE_TYPES.index(relation if relation in EDGE_TYPES else "other")
+        sources += [source, target]
+        targets += [target, source]
+        types += [relation_type, relation_type]
+
+    edge_index = np.array([sources, targets], dtype=np.int64).reshape(2, -1)
+    return attributes, edge_index, np.array(types, dtype=np.int8)
+
+
+def _graph_key(attributes: np.ndarray, edge_index: np.ndarray, edge_type: np.ndarray) -> bytes:
+    """Identity of an encoded graph: equal keys mean equal tensors."""
+    return b'|'.join((
+        attributes.tobytes(), edge_index.astype(np.int64).tobytes(), edge_type.tobytes(),
+    ))
+
+
+class HouseholdGraphStore:
+    """
+    Distinct household graphs in flat arrays, plus record-to-graph ids.
+
+    Graph ``g`` owns nodes ``node_offsets[g]:node_offsets[g + 1]`` of
+    ``node_features`` and edges ``edge_offsets[g]:edge_offsets[g + 1]`` of
+    ``edge_index`` (local node indices) and ``edge_type``.
+    ``record_graphs[split][i]`` is the graph of the i-th record of that
+    split, in output order. Graph ids never change once assigned, so an
+    append only adds new structures and ids.
+
+    Graphs are deduplicated by their encoding. Households already seen are
+    matched by a plain tuple of their fields first, so most records are
+    never re-encoded.
+    """
+
+    def __init__(self):
+        self._ids: Dict[bytes, int] = {}
+        self._household_ids: Dict[tuple, int] = {}
+        self._nodes: List[np.ndarray] = []
+        self._edges: List[np.ndarray] = []
+        self._edge_types: List[np.ndarray] = []
+        self._flat: Optional[Dict[str, np.ndarray]] = None
+        self.record_graphs: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def add(self, household: Dict) -> int:
+        """Graph id of ``household``, encoding it if the structure is new."""
+        fields = (
+            tuple((m["role"], m.get("age_bracket"), m.get("income_bracket"))
+                  for m in household["members"]),
+            tuple(tuple(r) for r in household["relationships"]),
+        )
+        graph_id = self._household_ids.get(fields)
+        if graph_id is not None:
+            return graph_id
+
+        attributes, edges, edge_types = encode_structure(household)
+        key = _graph_key(attributes, edges, edge_types)
+        graph_id = self._ids.get(key)
+        if graph_id is None:
+            graph_id = len(self._nodes)
+            self._ids[key] = graph_id
+            self._nodes.append(attributes)
+            self._edges.append(edges)
+            self._edge_types.append(edge_types)
+            self._flat = None
+        self._household_ids[fields] = graph_id
+        return graph_id
+
+    def add_records(self, split: str, records: Iterable[Dict]) -> None:
+        """Append the graph ids of ``records`` to ``record_graphs[split]``."""
+        graphs = self.record_graphs.setdefault(split, array('i'))
+        for record in records:
+            graphs.append(self.add(record["household"]))
+
+    def _tables(self) -> Dict[str, np.ndarray]:
+        if self._flat is None:
+            attributes = (
+                np.concatenate(self._nodes) if self._nodes else np.zeros((0, 3), dtype=np.int8)
+            )
+            self._flat = {
+                "node_attributes": attributes,
+                "node_features": node_features(attributes),
+                "node_offsets": _offsets(len(nodes) for nodes in self._nodes),
+                "edge_index": np.concatenate(self._edges, axis=1) if self._edges
+                else np.zeros((2, 0), dtype=np.int64),
+                "edge_type": np.concatenate(self._edge_types) if self._edge_types
+                else np.zeros(0, dtype=np.int8),
+                "edge_offsets": _offsets(len(types) for types in self._edge_types),
+            }
+        return self._flat
+
+    def graph(self, graph_id: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(node_features, edge_index, edge_type) of one graph, as views."""
+        tables = self._tables()
+        nodes = slice(tables["node_offsets"][graph_id], tables["node_offsets"][graph_id + 1])
+        edges = slice(tables["edge_offsets"][graph_id], tables["edge_offsets"][graph_id + 1])
+        return (
+            tables["node_features"][nodes],
+            tables["edge_index"][:, edges],
+            tables["edge_type"][edges],
+        )
+
+    def batch(self, graph_ids: Iterable[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Several graphs merged into one disconnected graph for a model batch.
+
+        Returns:
+            Tuple of (node_features (N, NODE_FEATURE_DIM), edge_index (2, E)
+            with node indices shifted per graph, edge_type (E,), and batch
+            (N,) giving each node's position in ``graph_ids``)
+        """
+        tables = self._tables()
+        ids = np.asarray(graph_ids, dtype=np.int64)
+        node_starts = tables["node_offsets"][ids]
+        node_counts = tables["node_offsets"][ids + 1] - node_starts
+        edge_starts = tables["edge_offsets"][ids]
+        edge_counts = tables["edge_offsets"][ids + 1] - edge_starts
+
+        edges = _ranges(edge_starts, edge_counts)
+        shift = np.repeat(np.cumsum(node_counts) - node_counts, edge_counts)
+        return (
+            tables["node_features"][_ranges(node_starts, node_counts)],
+            tables["edge_index"][:, edges] + shift,
+            tables["edge_type"][edges],
+            np.repeat(np.arange(len(ids)), node_counts),
+        )
+
+    def save(self, path: Path) -> None:
+        """Write the graph tables and record ids to an .npz file."""
+        tables = self._tables()
+        np.savez_compressed(
+            path,
+            version=np.array(GRAPH_STORE_VERSION),
+            **{name: tables[name] for name in _STORED_TABLES},
+            **{
+                f"{split}_graphs": np.frombuffer(graphs, dtype=np.int32)
+                for split, graphs in self.record_graphs.items()
+            },
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> 'HouseholdGraphStore':
+        """
+        Read a store written by ``save``; more records can then be added.
+
+        Raises:
+            ValueError: If the file was written with another format version
+        """
+        store = cls()
+        with np.load(path) as data:
+            if int(data["version"]) != GRAPH_STORE_VERSION:
+                raise ValueError(
+                    f"{path} has graph store version {int(data['version'])}, "
+                    f"expected {GRAPH_STORE_VERSION}"
+                )
+            tables = {name: data[name] for name in _STORED_TABLES}
+            for name in data.files:
+                if name.endswith("_graphs"):
+                    store.record_graphs[name[:-len("_graphs")]] = array('i', data[name].tobytes())
+
+        node_offsets, edge_offsets = tables["node_offsets"], tables["edge_offsets"]
+        for g in range(len(node_offsets) - 1):
+            attributes = tables["node_attributes"][node_offsets[g]:node_offsets[g + 1]]
+            edges = tables["edge_index"][:, edge_offsets[g]:edge_offsets[g + 1]]
+            edge_types = tables["edge_type"][edge_offsets[g]:edge_offsets[g + 1]]
+            store._ids[_graph_key(attributes, edges, edge_types)] = g
+            store._nodes.append(attributes)
+            store._edges.append(edges)
+            store._edge_types.append(edge_types)
+        tables["node_features"] = node_features(tables["node_attributes"])
+        store._flat = tables
+        return store
+
+
+_STORED_TABLES = ("node_attributes", "node_offsets", "edge_index", "edge_type", "edge_offsets")
+
+
+def _offsets(lengths: Iterable[int]) -> np.ndarray:
+    return np.concatenate([[0], np.cumsum(list(lengths), dtype=np.int64)]).astype(np.int64)
+
+
+def _ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatenation of arange(start, start + count) for each pair."""
+    total = int(counts.sum())
+    if not total:
+        return np.zeros(0, dtype=np.int64)
+    begins = np.cumsum(counts) - counts
+    return np.repeat(starts - begins, counts) + np.arange(total)
@@ -0,0 +1,253 @@
+"""
+Envis Insight Engine - Pre-tokenised Text Store
+
+Tokenises cleaned record text once, offline, instead of on every epoch and
+inference call. Each split is stored as:
+
+- {split}.{generation}.tokens: every record's token ids back to back, as
+  one flat uint16 buffer (uint32 if the vocabulary needs it), memory-mapped
+  on read
+- {split}.{generation}.offsets.npy: int64 (n + 1,) start of each record in
+  the buffer
+- {split}.tokens.json: metadata, including the store key derived from the
+  tokenizer (name and vocabulary fingerprint) and max_length, and the
+  names of the current token and offsets files
+
+The metadata file is the commit point: it is replaced atomically and only
+ever names files that are complete, so a reader never pairs offsets with
+a token buffer or record count they were not written for.
+
+A store is only used if its key matches the tokenizer and max_length asked
+for, so a tokenizer or length change can never silently serve stale ids.
+Splits only ever grow (preprocess.py --append), so a rerun tokenises just
+the records added since the last one.
+
+TokenizedTextDataset serves records as zero-copy views into the mapped
+buffer and pads a batch only when it is collated.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Bump when the file layout changes
+TOKEN_STORE_VERSION = 2
+
+
+def load_tokenizer(name: str):
+    """Load a HuggingFace tokenizer (e.g. ProsusAI/finbert)."""
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(name)
+
+
+def tokenizer_fingerprint(tokenizer) -> str:
+    """Hash of the tokenizer class, vocabulary and special tokens."""
+    digest = hashlib.sha256(type(tokenizer).__name__.encode('utf-8'))
+    for token, token_id in sorted(tokenizer.get_vocab().items()):
+        digest.update(f"{token}\0{token_id}\0".encode('utf-8'))
+    digest.update(json.dumps(tokenizer.all_special_ids).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def store_key(tokenizer_name: str, fingerprint: str, max_length: int) -> str:
+    state = {
+        "version": TOKEN_STORE_VERSION,
+        "tokenizer": tokenizer_name,
+        "tokenizer_fingerprint": fingerprint,
+        "max_length": max_length,
+    }
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def _meta_path(root: Path, split: str) -> Path:
+    return root / f"{split}.tokens.json"
+
+
+def _remove_stale(root: Path, split: str, meta: Dict[str, Any]) -> None:
+    """
+    Delete token and offsets files of the split the metadata no longer names.
+
+    Covers the generation-numbered files and the unnumbered
+    ``{split}.tokens`` and ``{split}.offsets.npy`` of version 1 stores.
+    """
+    current = {meta["tokens_file"], meta["offsets_file"]}
+    for pattern in (f"{split}.*.tokens", f"{split}.*.offsets.npy"):
+        for path in root.glob(pattern):
+            if path.name not in current:
+                path.unlink()
+    for name in (f"{split}.tokens", f"{split}.offsets.npy"):
+        if name not in current:
+            (root / name).unlink(missing_ok=True)
+
+
+def _ids_digest(record_ids: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for record_id in record_ids:
+        digest.update(record_id.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def write_token_store(
+    root: Path,
+    split: str,
+    record_ids: Sequence[str],
+    texts: Sequence[str],
+    tokenizer,
+    tokenizer_name: str,
+    max_length: int,
+    batch_size: int = 1000,
+) -> Dict[str, Any]:
+    """
+    Tokenise a split into ``root``, reusing an existing store where possible.
+
+    If a store with the same key already holds a prefix of ``record_ids``,
+    only the remaining records are tokenised and appended; otherwise the
+    split is tokenised from scratch into a new token file. Offsets go to a
+    new file too, and the metadata is replaced atomically last to switch
+    to them, so an interrupted run leaves the previous store readable.
+
+    Returns:
+        The split's metadata, with ``tokenised`` set to the number of
+        records tokenised by this call
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    meta_path = _meta_path(root, split)
+    fingerprint = tokenizer_fingerprint(tokenizer)
+    key = store_key(tokenizer_name, fingerprint, max_length)
+    dtype = np.uint16 if len(tokenizer) <= np.iinfo(np.uint16).max + 1 else np.uint32
+
+    generation, start, offsets = 0, 0, np.zeros(1, dtype=np.int64)
+    tokens_file = None
+    if meta_path.exists():
+        with open(meta_path) as f:
+            meta = json.load(f)
+        generation = meta.get("generation", 0) + 1
+        n_stored = meta["records"]
+        if (meta["version"] == TOKEN_STORE_VERSION and meta["key"] == key
+                and n_stored <= len(record_ids)
+                and meta["record_ids_sha256"] == _ids_digest(record_ids[:n_stored])):
+            start = n_stored
+            tokens_file = meta["tokens_file"]
+            offsets = np.load(root / meta["offsets_file"])[:n_stored + 1]
+
+    if tokens_file is None:
+        # Rebuild into a new file; the committed one stays intact until the
+        # metadata below names the new one
+        tokens_file = f"{split}.{generation}.tokens"
+    mode = 'r+b' if start else 'wb'
+    with open(root / tokens_file, mode) as f:
+        # Drop anything written past the last committed record
+        f.truncate(int(offsets[-1]) * np.dtype(dtype).itemsize)
+        f.seek(0, os.SEEK_END)
+        new_lengths: List[int] = []
+        for begin in range(start, len(texts), batch_size):
+            encoded = tokenizer(
+                list(texts[begin:begin + batch_size]),
+                truncation=True,
+                max_length=max_length,
+                add_special_tokens=True,
+            )["input_ids"]
+            for ids in encoded:
+                f.write(np.asarray(ids, dtype=dtype).tobytes())
+                new_lengths.append(len(ids))
+
+    offsets = np.concatenate([offsets, offsets[-1] + np.cumsum(new_lengths, dtype=np.int64)])
+    offsets_file = f"{split}.{generation}.offsets.npy"
+    np.save(root / offsets_file, offsets)
+
+    meta = {
+        "version": TOKEN_STORE_VERSION,
+        "key": key,
+        "tokenizer": tokenizer_name,
+        "tokenizer_fingerprint": fingerprint,
+        "max_length": max_length,
+        "dtype": np.dtype(dtype).name,
+        "pad_token_id": tokenizer.pad_token_id or 0,
+        "records": len(record_ids),
+        "tokens": int(offsets[-1]),
+        "record_ids_sha256": _ids_digest(record_ids),
+        "generation": generation,
+        "tokens_file": tokens_file,
+        "offsets_file": offsets_file,
+    }
+    tmp_meta = meta_path.with_suffix('.tmp')
+    with open(tmp_meta, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_meta, meta_path)
+    _remove_stale(root, split, meta)
+    return {**meta, "tokenised": len(record_ids) - start}
+
+
+class TokenizedTextDataset:
+    """
+    Map-style dataset over a pre-tokenised split.
+
+    ``dataset[i]`` is a read-only view of record i's token ids in the
+    memory-mapped buffer (no copy, no tokenisation); ``collate`` pads a
+    batch to its longest record. Records are in split file order, so index
+    i matches the i-th record of the split and of the household graph
+    store. Works directly as a torch DataLoader dataset.
+
+    Pass ``tokenizer_name`` and ``max_length`` to refuse a store built for
+    anything else (e.g. an old max_length).
+    """
+
+    def __init__(
+        self,
+        root: str,
+        split: str,
+        tokenizer_name: Optional[str] = None,
+        max_length: Optional[int] = None,
+    ):
+        root = Path(root)
+        meta_path = _meta_path(root, split)
+        with open(meta_path) as f:
+            self.meta = json.load(f)
+        if self.meta["version"] != TOKEN_STORE_VERSION:
+            raise ValueError(f"{meta_path} has token store version {self.meta['version']}")
+        for name, expected in (("tokenizer", tokenizer_name), ("max_length", max_length)):
+            if expected is not None and self.meta[name] != expected:
+                raise ValueError(
+                    f"{meta_path} was built with {name}={self.meta[name]!r}, "
+                    f"not {expected!r}; re-run pretokenize.py"
+                )
+
+        self.offsets = np.load(root / self.meta["offsets_file"], mmap_mode='r')
+        if self.meta["tokens"]:
+            self.tokens = np.memmap(
+                root / self.meta["tokens_file"], dtype=self.meta["dtype"], mode='r', shape=(self.meta["tokens"],),
+            )
+        else:
+            self.tokens = np.zeros(0, dtype=self.meta["dtype"])
+        self.pad_token_id = self.meta["pad_token_id"]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        return self.tokens[self.offsets[index]:self.offsets[index + 1]]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Tokens per record, e.g. for length-bucketed batching."""
+        return np.diff(self.offsets)
+
+    def collate(self, items: Sequence[np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Pad token views to the longest in the batch.
+
+        Returns:
+            Dict of int64 (batch, longest) arrays: input_ids and attention_mask
+        """
+        longest = max((len(item) for item in items), default=0)
+        input_ids = np.full((len(items), longest), self.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(items), longest), dtype=np.int64)
+        for row, item in enumerate(items):
+            input_ids[row, :len(item)] = item
+            attention_mask[row, :len(item)] = 1
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
@@ -0,0 +1,292 @@
+"""
+Envis Insight Engine - Columnar Transaction Store
+
+On-disk storage for transaction histories (HuggingFace transaction
+datasets, Open Banking feeds) laid out for TransactionEncoder.
+
+Each column is a fixed-width .npy file, memory-mapped on read, with one
+row per transaction. Rows are sorted by household, then time, and
+offsets.npy gives each household's row range, so a household's history,
+or its last N transactions, is a contiguous zero-copy slice of every
+column.
+
+Columns (named as TransactionEncoder.forward arguments):
+- timestamps: int64 seconds since the epoch (UTC)
+- amounts: float32
+- categories: int32 index into the category vocabulary (< num_categories)
+- merchants: int32 index into the merchant vocabulary, 0 = unknown
+- day_of_week (Monday = 0), day_of_month (0-30), month (0-11): int32
+
+Index columns are int32 so ``torch.from_numpy`` gives tensors the
+embedding layers accept without a cast.
+
+Usage:
+    meta = write_transaction_store(Path("data/transactions"), transactions)
+    store = TransactionStore("data/transactions")
+    recent = store.last_n("household_123", 50)
+    batch = store.batch(["household_123", "household_456"], 50)
+"""
+
+import json
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Bump when the column layout changes
+TRANSACTION_STORE_VERSION = 1
+
+COLUMNS = {
+    "timestamps": np.int64,
+    "amounts": np.float32,
+    "categories": np.int32,
+    "merchants": np.int32,
+    "day_of_week": np.int32,
+    "day_of_month": np.int32,
+    "month": np.int32,
+}
+
+# Vocabulary limits of ModelConfig (num_categories, transaction_vocab_size)
+NUM_CATEGORIES = 120
+MERCHANT_VOCAB_SIZE = 8001  # 8000 merchants + unknown
+
+UNKNOWN_MERCHANT = 0
+
+
+def write_transaction_store(
+    root: Path,
+    transactions: Iterable[Dict[str, Any]],
+    category_vocab: Optional[Sequence[str]] = None,
+    merchant_vocab: Optional[Sequence[str]] = None,
+    num_categories: int = NUM_CATEGORIES,
+    merchant_vocab_size: int = MERCHANT_VOCAB_SIZE,
+) -> Dict[str, Any]:
+    """
+    Build a store from transaction dicts.
+
+    Each transaction has ``household_id``, ``timestamp`` (epoch seconds or
+    an ISO 8601 string), ``amount``, ``category`` and ``merchant``.
+    Category and merchant strings are mapped through the given
+    vocabularies; pass those of the trained model when adding a new feed.
+    Without them, categories are numbered in sorted order and the
+    ``merchant_vocab_size - 1`` most frequent merchants are kept, the rest
+    mapping to UNKNOWN_MERCHANT. Integer categories and merchants are
+    stored as given.
+
+    Raises:
+        ValueError: If there are more categories than ``num_categories``,
+            a category is missing from ``category_vocab``, or a category
+            or merchant id is outside its embedding table
+
+    Returns:
+        The store metadata (also written to meta.json)
+    """
+    households: List[str] = []
+    timestamps: List[Any] = []
+    amounts: List[float] = []
+    categories: List[Any] = []
+    merchants: List[Any] = []
+    for transaction in transactions:
+        households.append(str(transaction["household_id"]))
+        timestamps.append(transaction["timestamp"])
+        amounts.append(transaction["amount"])
+        categories.append(transaction["category"])
+        merchants.append(transaction["merchant"])
+
+    if category_vocab is None and any(isinstance(c, str) for c in categories):
+        category_vocab = sorted({str(c) for c in categories})
+    if category_vocab is not None:
+        if len(category_vocab) > num_categories:
+            raise ValueError(
+                f"{len(category_vocab)} categories exceed num_categories ({num_categories})"
+            )
+        category_ids = {name: i for i, name in enumerate(category_vocab)}
+        missing = {str(c) for c in categories} - category_ids.keys()
+        if missing:
+            raise ValueError(f"Categories not in the vocabulary: {sorted(missing)[:10]}")
+        categories = [category_ids[str(c)] for c in categories]
+
+    if merchant_vocab is None and any(isinstance(m, str) for m in merchants):
+        counts = Counter(str(m) for m in merchants)
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        merchant_vocab = [name for name, _ in ranked[:merchant_vocab_size - 1]]
+    if merchant_vocab is not None:
+        # Index 0 is reserved for unknown merchants
+        merchant_ids = {name: i + 1 for i, name in enumerate(merchant_vocab)}
+        merchants = [merchant_ids.get(str(m), UNKNOWN_MERCHANT) for m in merchants]
+
+    household_ids, household_index = np.unique(np.array(households, dtype=np.str_), return_inverse=True)
+    seconds = _epoch_seconds(timestamps)
+    order = np.lexsort((seconds, household_index))
+
+    columns = {
+        "timestamps": seconds,
+        "amounts": np.asarray(amounts, dtype=np.float32),
+        "categories": np.asarray(categories, dtype=np.int32),
+        "merchants": np.asarray(merchants, dtype=np.int32),
+    }
+    _check_range("Category", columns["categories"], num_categories)
+    _check_range("Merchant", columns["merchants"], merchant_vocab_size)
+    columns = {name: column[order] for name, column in columns.items()}
+    columns.update(_calendar_columns(columns["timestamps"]))
+    counts = np.bincount(household_index, minlength=len(household_ids))
+    offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    root.mkdir(parents=True, exist_ok=True)
+    # Invalidate any previous store before its columns are overwritten
+    (root / "meta.json").unlink(missing_ok=True)
+    for name, dtype in COLUMNS.items():
+        np.save(root / f"{name}.npy", columns[name].astype(dtype, copy=False))
+    np.save(root / "offsets.npy", offsets)
+    np.save(root / "households.npy", household_ids)
+
+    meta = {
+        "version": TRANSACTION_STORE_VERSION,
+        "transactions": int(offsets[-1]),
+        "households": len(household_ids),
+        "columns": {name: np.dtype(dtype).name for name, dtype in COLUMNS.items()},
+        "time_range": [
+            int(columns["timestamps"].min()) if len(seconds) else None,
+            int(columns["timestamps"].max()) if len(seconds) else None,
+        ],
+        "category_vocab": list(category_vocab) if category_vocab is not None else None,
+        "merchant_vocab": list(merchant_vocab) if merchant_vocab is not None else None,
+    }
+    # Written last: a store without meta.json is incomplete
+    tmp_meta = root / "meta.json.tmp"
+    with open(tmp_meta, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_meta, root / "meta.json")
+    return meta
+
+
+class TransactionStore:
+    """
+    Read-only, memory-mapped view of a store built by ``write_transaction_store``.
+
+    Household lookups are a binary search over the sorted household ids;
+    slices of the mapped columns are views, so nothing is copied or
+    decoded until ``batch`` pads histories into fixed-size arrays.
+    """
+
+    def __init__(self, root: str):
+        root = Path(root)
+        with open(root / "meta.json") as f:
+            self.meta = json.load(f)
+        if self.meta["version"] != TRANSACTION_STORE_VERSION:
+            raise ValueError(
+                f"{root} has transaction store version {self.meta['version']}, "
+                f"expected {TRANSACTION_STORE_VERSION}"
+            )
+        self.columns = {name: np.load(root / f"{name}.npy", mmap_mode='r') for name in COLUMNS}
+        self.offsets = np.load(root / "offsets.npy", mmap_mode='r')
+        self.households = np.load(root / "households.npy", mmap_mode='r')
+
+    def __len__(self) -> int:
+        return len(self.households)
+
+    def __contains__(self, household_id: str) -> bool:
+        return self._household(household_id) is not None
+
+    def _household(self, household_id: str) -> Optional[int]:
+        i = int(np.searchsorted(self.households, str(household_id)))
+        if i < len(self.households) and self.households[i] == str(household_id):
+            return i
+        return None
+
+    def _rows(self, household_id: str, before: Optional[int]) -> slice:
+        h = self._household(household_id)
+        if h is None:
+            return slice(0, 0)
+        start, end = int(self.offsets[h]), int(self.offsets[h + 1])
+        if before is not None:
+            timestamps = self.columns["timestamps"][start:end]
+            end = start + int(np.searchsorted(timestamps, before, side='left'))
+        return slice(start, end)
+
+    def history(self, household_id: str, before: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        All of a household's transactions in time order, as column views.
+
+        ``before`` (epoch seconds) drops transactions at or after that time.
+        Unknown households give empty columns.
+        """
+        rows = self._rows(household_id, before)
+        return {name: column[rows] for name, column in self.columns.items()}
+
+    def last_n(
+        self,
+        household_id: str,
+        n: int,
+        before: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """A household's most recent ``n`` transactions (oldest first), as column views."""
+        rows = self._rows(household_id, before)
+        start = max(rows.start, rows.stop - n)
+        return {name: column[start:rows.stop] for name, column in self.columns.items()}
+
+    def batch(
+        self,
+        household_ids: Sequence[str],
+        n: int,
+        before: Optional[Sequence[int]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Last ``n`` transactions of several households, right-padded to ``n``.
+
+        Returns:
+            Dict of (batch, n) arrays keyed like TransactionEncoder.forward
+            arguments (amounts, categories, merchants, day_of_week,
+            day_of_month, month) plus timestamps and transaction_mask
+            (1 for real transactions)
+        """
+        batch = {
+            name: np.zeros((len(household_ids), n), dtype=dtype)
+            for name, dtype in COLUMNS.items()
+        }
+        mask = np.zeros((len(household_ids), n), dtype=np.int64)
+        for row, household_id in enumerate(household_ids):
+            recent = self.last_n(household_id, n, before[row] if before is not None else None)
+            length = len(recent["timestamps"])
+            for name, column in recent.items():
+                batch[name][row, :length] = column
+            mask[row, :length] = 1
+        batch["transaction_mask"] = mask
+        return batch
+
+
+def _epoch_seconds(values: List[Any]) -> np.ndarray:
+    """Epoch seconds from numbers or ISO 8601 strings, each converted by its own type."""
+    seconds = np.zeros(len(values), dtype=np.int64)
+    strings = [i for i, v in enumerate(values) if isinstance(v, str)]
+    numbers = [i for i, v in enumerate(values) if not isinstance(v, str)]
+    if numbers:
+        seconds[numbers] = np.asarray([values[i] for i in numbers], dtype=np.int64)
+    if strings:
+        seconds[strings] = np.array(
+            [values[i].rstrip('Z') for i in strings], dtype='datetime64[s]',
+        ).astype(np.int64)
+    return seconds
+
+
+def _check_range(name: str, ids: np.ndarray, size: int) -> None:
+    """Raise if an id falls outside an embedding table of ``size`` rows."""
+    if len(ids) and (ids.min() < 0 or ids.max() >= size):
+        raise ValueError(
+            f"{name} ids must be in [0, {size}), got [{ids.min()}, {ids.max()}]"
+        )
+
+
+def _calendar_columns(seconds: np.ndarray) -> Dict[str, np.ndarray]:
+    """Day of week, day of month and month (zero-based, UTC) for epoch seconds."""
+    instants = seconds.astype('datetime64[s]')
+    days = instants.astype('datetime64[D]')
+    months = instants.astype('datetime64[M]')
+    return {
+        # 1970-01-01 was a Thursday
+        "day_of_week": ((days.astype(np.int64) + 3) % 7).astype(np.int32),
+        "day_of_month": (days - months.astype('datetime64[D]')).astype(np.int32),
+        "month": (months.astype(np.int64) % 12).astype(np.int32),
+    }